@@ -0,0 +1,181 @@
+"""Repeatable benchmarks of pyvds against segyio on synthetic cubes
+
+Times the same operations through pyvds on a VDS file and through segyio on
+the SEG-Y file it was converted from, and stores the results as JSON so runs
+on different versions can be compared.
+
+Usage:
+    python benchmarks/run.py [--shape IL XL NS] [--repeat N] [--data DIR] [--output FILE]
+    python benchmarks/run.py compare BASELINE.json CANDIDATE.json [--threshold 1.1]
+
+Peak memory is the tracemalloc high-water mark of one extra, untimed run of
+each case. It covers numpy and Python allocations, but not the internal
+buffers of OpenVDS or segyio.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import segyio
+
+import pyvds
+from pyvds.read import VdsReader
+
+from synthetic import synthetic_cube
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def cases(sgy, vds):
+    """Yields (name, library, function) for every benchmark"""
+    vdsfile = pyvds.open(vds)
+    segyfile = segyio.open(sgy)
+    reader = VdsReader(vds)
+    try:
+        il = vdsfile.ilines[len(vdsfile.ilines) // 2]
+        xl = vdsfile.xlines[len(vdsfile.xlines) // 2]
+        z = len(vdsfile.samples) // 2
+        sub = [n // 4 for n in (reader.n_ilines, reader.n_xlines, reader.n_samples)]
+
+        yield 'open', 'pyvds', lambda: pyvds.open(vds).close()
+        yield 'open', 'segyio', lambda: segyio.open(sgy).close()
+        yield 'inline', 'pyvds', lambda: vdsfile.iline[il]
+        yield 'inline', 'segyio', lambda: segyfile.iline[il]
+        yield 'crossline', 'pyvds', lambda: vdsfile.xline[xl]
+        yield 'crossline', 'segyio', lambda: segyfile.xline[xl]
+        yield 'zslice', 'pyvds', lambda: vdsfile.depth_slice[z]
+        yield 'zslice', 'segyio', lambda: segyfile.depth_slice[z]
+        yield 'traces', 'pyvds', lambda: [trace for trace in vdsfile.trace]
+        yield 'traces', 'segyio', lambda: [trace for trace in segyfile.trace]
+        yield 'headers', 'pyvds', lambda: [header for header in vdsfile.header]
+        yield 'headers', 'segyio', lambda: [header for header in segyfile.header]
+        yield 'attribute', 'pyvds', lambda: vdsfile.attributes(segyio.TraceField.CDP_X)[:]
+        yield 'attribute', 'segyio', lambda: segyfile.attributes(segyio.TraceField.CDP_X)[:]
+        yield 'subvolume', 'pyvds', lambda: reader.read_subvolume(sub[0], 3 * sub[0], sub[1], 3 * sub[1],
+                                                                  sub[2], 3 * sub[2])
+        yield 'volume', 'pyvds', lambda: reader.read_volume()
+        yield 'volume', 'segyio', lambda: segyio.tools.cube(segyfile)
+    finally:
+        reader.close()
+        segyfile.close()
+        vdsfile.close()
+
+
+def measure(function, repeat):
+    function()  # warm up
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'min': min(times),
+            'median': statistics.median(times),
+            'mean': statistics.mean(times),
+            'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+            'repeat': repeat,
+            'peak_bytes': peak}
+
+
+def version():
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=HERE, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run(args):
+    sgy, vds = synthetic_cube(args.data, *args.shape)
+    results = {}
+    for name, library, function in cases(sgy, vds):
+        result = measure(function, args.repeat)
+        results.setdefault(name, {})[library] = result
+        print("{:<10} {:<7} median {:10.3f} ms  min {:10.3f} ms  peak {:10.1f} KiB".format(
+            name, library, 1e3 * result['median'], 1e3 * result['min'], result['peak_bytes'] / 2**10))
+
+    report = {'version': version(),
+              'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+              'python': platform.python_version(),
+              'platform': platform.platform(),
+              'shape': list(args.shape),
+              'results': results}
+    output = args.output or os.path.join(HERE, 'results', '{}-{}x{}x{}.json'.format(report['version'], *args.shape))
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print("results written to", output)
+
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    if baseline['shape'] != candidate['shape']:
+        print("warning: comparing cubes of shape {} and {}".format(baseline['shape'], candidate['shape']))
+
+    regressions = 0
+    print("{:<10} {:>12} {:>12} {:>7}".format('pyvds', baseline['version'], candidate['version'], 'ratio'))
+    for name, libraries in candidate['results'].items():
+        if 'pyvds' not in libraries or 'pyvds' not in baseline['results'].get(name, {}):
+            continue
+        before = baseline['results'][name]['pyvds']['median']
+        after = libraries['pyvds']['median']
+        ratio = after / before
+        slower = ratio > args.threshold
+        regressions += slower
+        print("{:<10} {:9.3f} ms {:9.3f} ms {:6.2f}x{}".format(name, 1e3 * before, 1e3 * after, ratio,
+                                                              '  REGRESSION' if slower else ''))
+    return 1 if regressions else 0
+
+
+def main(argv):
+    if argv[:1] == ['compare']:
+        parser = argparse.ArgumentParser(prog='run.py compare')
+        parser.add_argument('baseline')
+        parser.add_argument('candidate')
+        parser.add_argument('--threshold', type=float, default=1.1,
+                            help='median time ratio above which a case is a regression')
+        return compare(parser.parse_args(argv[1:]))
+
+    parser = argparse.ArgumentParser(prog='run.py')
+    parser.add_argument('--shape', type=int, nargs=3, default=[100, 100, 500], metavar=('IL', 'XL', 'NS'))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--data', default=os.path.join(HERE, 'data'),
+                        help='directory the synthetic cubes are generated in, and reused from')
+    parser.add_argument('--output', help='results file, benchmarks/results/<version>-<shape>.json by default')
+    run(parser.parse_args(argv))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
+
+#   Copyright 2021 Equinor
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
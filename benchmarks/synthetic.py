@@ -0,0 +1,96 @@
+"""Generates synthetic SEG-Y and VDS cubes to benchmark against
+
+The SEG-Y file is written with segyio and converted with OpenVDS'
+SEGYImport, which must be on PATH (it ships with the openvds wheel).
+Generated files are kept in the output directory and reused by later runs
+of the same shape.
+
+Usage: python benchmarks/synthetic.py OUTPUT_DIR N_ILINES N_XLINES N_SAMPLES
+"""
+import os
+import shutil
+import subprocess
+import sys
+
+import numpy as np
+import segyio
+
+
+def make_segy(filename, n_ilines, n_xlines, n_samples, format=5, seed=0):
+    """Writes a post-stack cube of dipping reflectors and noise
+
+    Inlines are numbered from 1000, crosslines from 2000, and samples are
+    4 ms apart.
+    """
+    spec = segyio.spec()
+    spec.ilines = np.arange(1000, 1000 + n_ilines, dtype=np.intc)
+    spec.xlines = np.arange(2000, 2000 + n_xlines, dtype=np.intc)
+    spec.samples = np.arange(n_samples, dtype=float) * 4
+    spec.sorting = segyio.TraceSortingFormat.INLINE_SORTING
+    spec.format = format
+
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_samples, dtype=np.float32)
+    partial = filename + '.partial'
+    with segyio.create(partial, spec) as f:
+        f.bin.update(hdt=4000, hns=n_samples, format=format)
+        trace = 0
+        for i in range(n_ilines):
+            for x in range(n_xlines):
+                f.header[trace] = {
+                    segyio.TraceField.INLINE_3D: int(spec.ilines[i]),
+                    segyio.TraceField.CROSSLINE_3D: int(spec.xlines[x]),
+                    segyio.TraceField.CDP_X: 400000 + 25 * i,
+                    segyio.TraceField.CDP_Y: 6000000 + 25 * x,
+                    segyio.TraceField.SourceGroupScalar: 1,
+                    segyio.TraceField.TRACE_SAMPLE_COUNT: n_samples,
+                    segyio.TraceField.TRACE_SAMPLE_INTERVAL: 4000,
+                }
+                depth = 0.1 * i + 0.05 * x
+                f.trace[trace] = (np.sin((t - depth) / 6.0) * np.exp(-t / (4.0 * n_samples))
+                                  + 0.05 * rng.standard_normal(n_samples)).astype(np.float32)
+                trace += 1
+    os.replace(partial, filename)
+
+
+def make_vds(sgy_filename, vds_filename, segyimport='SEGYImport'):
+    """Converts sgy_filename to vds_filename with SEGYImport"""
+    executable = shutil.which(segyimport)
+    if executable is None:
+        raise RuntimeError("{} not found on PATH, it is needed to create VDS files".format(segyimport))
+    partial = vds_filename + '.partial'
+    subprocess.run([executable, '--vdsfile', partial, sgy_filename],
+                   check=True, stdout=subprocess.DEVNULL)
+    os.replace(partial, vds_filename)
+
+
+def synthetic_cube(directory, n_ilines, n_xlines, n_samples):
+    """Returns (sgy, vds) paths of a synthetic cube, creating it if needed"""
+    os.makedirs(directory, exist_ok=True)
+    stem = os.path.join(directory, 'synthetic-{}x{}x{}'.format(n_ilines, n_xlines, n_samples))
+    sgy, vds = stem + '.sgy', stem + '.vds'
+    if not os.path.exists(sgy):
+        make_segy(sgy, n_ilines, n_xlines, n_samples)
+    if not os.path.exists(vds):
+        make_vds(sgy, vds)
+    return sgy, vds
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 5:
+        raise RuntimeError("This script accepts exactly 4 arguments: output_dir n_ilines n_xlines n_samples")
+    print(*synthetic_cube(sys.argv[1], *(int(n) for n in sys.argv[2:])))
+
+#   Copyright 2021 Equinor
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
@@ -0,0 +1,30 @@
+import os
+import sys
+import time
+
+from pyvds.read import VdsReader
+
+if len(sys.argv) not in (2, 3):
+    raise RuntimeError("This example accepts 1 or 2 arguments: input_file [max_workers,...]")
+
+filename = sys.argv[1]
+worker_counts = [int(n) for n in sys.argv[2].split(',')] if len(sys.argv) == 3 else [2, 4, 8, os.cpu_count()]
+REPEATS = 3
+
+def throughput(reader, max_workers):
+    best = float('inf')
+    for _ in range(REPEATS):
+        t0 = time.time()
+        volume = reader.read_subvolume(0, reader.n_ilines,
+                                       0, reader.n_xlines,
+                                       0, reader.n_samples, max_workers=max_workers)
+        best = min(best, time.time() - t0)
+    return volume.nbytes / best / 1e6, best
+
+with VdsReader(filename) as reader:
+    print("volume", (reader.n_ilines, reader.n_xlines, reader.n_samples), "brick size", reader.brick_size)
+    single, took = throughput(reader, None)
+    print("single request: {:8.1f} MB/s ({:.3f} s)".format(single, took))
+    for max_workers in worker_counts:
+        tiled, took = throughput(reader, max_workers)
+        print("{:3d} workers:     {:8.1f} MB/s ({:.3f} s), {:.2f}x".format(max_workers, tiled, took, tiled / single))
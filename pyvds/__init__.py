@@ -1,5 +1,10 @@
 from .open import open
 from .tools import cube
+from .futures import gather
+from .array import VdsArray
+from .metadata import enable_metadata_cache, disable_metadata_cache
+from .pool import ReaderPool
+from .export import to_segy
 
 #   Copyright 2021 Equinor
 #
@@ -1,26 +1,220 @@
+import copy
+import functools
+import itertools
+from collections import deque
 from collections.abc import Mapping
 
+import numpy as np
+
+from .convert import Conversion
 from .read import VdsReader
 
-class Accessor(VdsReader):
+class Accessor(object):
+    """Lightweight view over a VdsReader
+
+    Accessors borrow the OpenVDS handle of the reader they are given, so any
+    number of them can share one open volume. If given a filename instead,
+    the accessor opens, owns and closes its own reader.
+
+    Iterating streams the values, reading up to prefetch lines (or inlines'
+    worth of traces) ahead in the background while the current one is used.
+    """
+    prefetch = 2
+    line_axis = None
+    line_step = 1
+    read_args = {}
+
+    def __init__(self, reader):
+        if isinstance(reader, VdsReader):
+            self._reader = reader
+            self._owns_reader = False
+        else:
+            self._reader = VdsReader(reader)
+            self._owns_reader = True
+        self._filename = self._reader._filename
+        self.slice_function = None
+        self.array_function = None
+        self.async_function = None
+        self.value_shape = None
+        self._buffers = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._owns_reader:
+            self._reader.close()
+
+    def use_buffers(self, buffers=2):
+        """Reads single values into a ring of reusable buffers
+
+        Instead of allocating a new array per subscript, accessor[key] reads
+        into the next buffer in the ring and returns it. A returned value is
+        overwritten once every buffer has been used again, so copy it if it
+        must outlive that. Slicing and iteration are unaffected.
+
+        Parameters
+        ----------
+        buffers : int or list of numpy.ndarray or None
+            The number of buffers to allocate, or the buffers themselves, e.g.
+            arrays in shared memory or numpy.memmaps. None turns reuse off
+        """
+        if buffers is None:
+            self._buffers = None
+            return
+        if self.value_shape is None:
+            raise TypeError("{} does not support reusable buffers".format(type(self).__name__))
+        if isinstance(buffers, int):
+            dtype = self.read_args.get('dtype')
+            dtype = np.float32 if dtype is None else dtype
+            buffers = [np.empty(self.value_shape, dtype=dtype) for _ in range(buffers)]
+        for buffer in buffers:
+            if buffer.shape != tuple(self.value_shape):
+                raise ValueError("Buffer has shape {}, expected {}".format(buffer.shape, tuple(self.value_shape)))
+        self._buffers = deque(buffers)
+
+    def at_lod(self, lod):
+        """A view of the same lines at a coarser level of detail
+
+        Parameters
+        ----------
+        lod : int
+            Level of detail. Level n is decimated by 2**n along every axis, see
+            VdsReader.lod_axes() for the coordinates of the values
 
-    def __init__(self, file):
-        super(Accessor, self).__init__()
+        Returns
+        -------
+        accessor : Accessor
+            Holding the lines of VdsReader.lod_axes(lod), every 2**lod-th line
+            of this accessor. Inlines and crosslines are keyed by their line
+            numbers, zslices indexed by their position among the decimated ones
+        """
+        self._reader._check_lod(lod)
+        return self._view(lod=lod)
+
+    def ordered(self, order):
+        """A view of the same lines with their axes in another order
+
+        Parameters
+        ----------
+        order : str
+            The axis order of every line, as the letters i (inline), x
+            (crossline) and s (sample), e.g. 'sx' for sample-major inlines
+            ready for image encoding. Lines are C-contiguous in that order
+
+        Returns
+        -------
+        accessor : Accessor
+            Indexed like this accessor
+        """
+        if self.line_axis is not None:
+            self._reader._permutation(self._reader._line_order(self.line_axis), order)
+        return self._view(order=order)
+
+    def converted(self, dtype, clip=None, scale=None):
+        """A view of the same lines converted to another dtype
+
+        Parameters
+        ----------
+        dtype : numpy.dtype
+            The type of the lines, e.g. numpy.float16 or numpy.uint8
+        clip : (float, float), optional
+            Clip values to this range before converting. For integer dtypes
+            without scale, the range is mapped linearly onto the full range
+            of the type
+        scale : float, optional
+            Multiply values by scale, after clipping
+
+        Returns
+        -------
+        accessor : Accessor
+            Indexed like this accessor
+        """
+        Conversion(dtype, clip, scale)
+        return self._view(dtype=dtype, clip=clip, scale=scale)
+
+    def _view(self, **read_args):
+        if self.line_axis is None:
+            raise TypeError("{} does not support {}".format(type(self).__name__, ', '.join(read_args)))
+        view = copy.copy(self)
+        view._owns_reader = False
+        view._buffers = None
+        view.read_args = dict(self.read_args, **read_args)
+        view.values_function = functools.partial(self.values_function, **read_args)
+        view.slice_function = functools.partial(self.slice_function, **read_args)
+        view.async_function = functools.partial(self.async_function, **read_args)
+
+        lod = view.read_args.get('lod', 0)
+        n = (self._reader.n_ilines, self._reader.n_xlines, self._reader.n_samples)[self.line_axis]
+        view.line_step = 1 << lod
+        view.len_object = -(-n >> lod)
+        shape = self._reader._line_shape(self.line_axis, lod)
+        order = view.read_args.get('order')
+        if order is not None:
+            natural = self._reader._line_order(self.line_axis)
+            shape = [shape[natural.index(axis)] for axis in order]
+        view.value_shape = shape
+        return view
+
+    def _value(self, key):
+        if not self._buffers:
+            return self.values_function(key)
+        buffer = self._buffers[0]
+        self._buffers.rotate(-1)
+        return self.values_function(key, out=buffer)
 
     def __iter__(self):
+        if self.async_function is not None:
+            indices = range(0, len(self) * self.line_step, self.line_step)
+            return self._prefetched(self.async_function, indices)
+        if self.array_function is not None:
+            return self._iter_blocks()
         return iter(self[:])
 
+    def _iter_blocks(self):
+        step = self._reader.n_xlines
+        blocks = (range(start, min(start + step, len(self))) for start in range(0, len(self), step))
+        executor = self._reader._get_executor()
+        submit = lambda block: executor.submit(self.array_function, block)
+        for values in self._prefetched(submit, blocks):
+            for value in values:
+                yield value
+
+    def _prefetched(self, submit, chunks):
+        """Yields submit(chunk).result() in order, keeping prefetch chunks in flight"""
+        chunks = iter(chunks)
+        pending = deque(submit(chunk) for chunk in itertools.islice(chunks, self.prefetch + 1))
+        try:
+            while pending:
+                result = pending.popleft().result()
+                pending.extend(submit(chunk) for chunk in itertools.islice(chunks, 1))
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
     def __len__(self):
         return self.len_object
 
     def __getitem__(self, subscript):
         if isinstance(subscript, slice):
             start, stop, step = subscript.indices(len(self))
+            if self.slice_function is not None:
+                s = self.line_step
+                return self.slice_function(start * s, stop * s, step * s)
+            if self.array_function is not None:
+                return self.array_function(range(start, stop, step))
             return [self.values_function(index) for index in range(start, stop, step)]
+        elif self.array_function is not None and not np.isscalar(subscript):
+            indices = np.asarray(subscript)
+            return self.array_function(np.where(indices < 0, indices + len(self), indices))
         elif subscript < 0:
-            return self.values_function(len(self)+subscript)
+            return self._value((len(self)+subscript) * self.line_step)
         else:
-            return self.values_function(subscript)
+            return self._value(subscript * self.line_step)
 
     def __contains__(self, key):
         return key in self.keys_object
@@ -35,74 +229,191 @@ class Accessor(VdsReader):
         return self[:]
 
     def items(self):
-        return zip(self.keys(), self[:])
+        return zip(self.keys(), iter(self))
 
 
 class SliceAccessor(Accessor):
+    def __contains__(self, key):
+        return key in self.axis and self.axis.index(key) % self.line_step == 0
+
     def __getitem__(self, subscript):
         if isinstance(subscript, slice):
             # Acquiris Quodcumquae Rapis
             start, stop, step = subscript.start, subscript.stop, subscript.step
             if step is None:
-                step = int(self.keys_object[1] - self.keys_object[0])
+                step = int(self.axis.step)
             if start is None:
-                start = int(self.keys_object[0])
+                start = int(self.axis.first)
             if stop is None:
                 stop = int(self.keys_object[-1] + 1)
-            return [self.values_function(index) for index in range(start, stop, step)]
+            coords = range(start, stop, step)
+            if len(coords) == 0:
+                return self.slice_function(0, 0, 1)
+            line_step = int(self.axis.step)
+            if step % line_step != 0:
+                raise IndexError("Step {} is not a multiple of the line spacing {}".format(step, line_step))
+            first = self.axis.index(coords[0])
+            last = self.axis.index(coords[-1])
+            return self.slice_function(first, last + (1 if step > 0 else -1), step // line_step)
         elif subscript < 0:
-            return self.values_function(len(self)+subscript)
+            return self._value(len(self)+subscript)
         else:
-            return self.values_function(subscript)
+            return self._value(subscript)
 
 
 class InlineAccessor(SliceAccessor, Mapping):
-    def __init__(self, file):
-        super(Accessor, self).__init__(file)
-        self.len_object = self.n_ilines
-        self.keys_object = self.ilines
-        self.values_function = self.read_inline_number
+    line_axis = 0
+
+    def __init__(self, reader):
+        super(InlineAccessor, self).__init__(reader)
+        self.len_object = self._reader.n_ilines
+        self.values_function = self._reader.read_inline_number
+        self.slice_function = self._reader.read_inlines
+        self.async_function = self._reader.read_inline_async
+        self.value_shape = self._reader._line_shape(0)
+
+    # Delegated, so the coordinates are only built on first use, see VdsReader
+    @property
+    def keys_object(self):
+        return self._reader.ilines[::self.line_step]
+
+    @property
+    def axis(self):
+        return self._reader.iline_axis
 
 class CrosslineAccessor(SliceAccessor, Mapping):
-    def __init__(self, file):
-        super(Accessor, self).__init__(file)
-        self.len_object = self.n_xlines
-        self.keys_object = self.xlines
-        self.values_function = self.read_crossline_number
+    line_axis = 1
+
+    def __init__(self, reader):
+        super(CrosslineAccessor, self).__init__(reader)
+        self.len_object = self._reader.n_xlines
+        self.values_function = self._reader.read_crossline_number
+        self.slice_function = self._reader.read_crosslines
+        self.async_function = self._reader.read_crossline_async
+        self.value_shape = self._reader._line_shape(1)
+
+    @property
+    def keys_object(self):
+        return self._reader.xlines[::self.line_step]
+
+    @property
+    def axis(self):
+        return self._reader.xline_axis
 
 class ZsliceAccessor(Accessor, Mapping):
-    def __init__(self, file):
-        super(Accessor, self).__init__(file)
-        self.len_object = self.n_samples
-        self.keys_object = self.samples
-        self.values_function = self.read_zslice
+    line_axis = 2
+
+    def __init__(self, reader):
+        super(ZsliceAccessor, self).__init__(reader)
+        self.len_object = self._reader.n_samples
+        self.values_function = self._reader.read_zslice
+        self.slice_function = self._reader.read_zslices
+        self.async_function = self._reader.read_zslice_async
+        self.value_shape = self._reader._line_shape(2)
+
+    @property
+    def keys_object(self):
+        return self._reader.samples[::self.line_step]
 
 class HeaderAccessor(Accessor, Mapping):
-    def __init__(self, file):
-        super(Accessor, self).__init__(file)
-        self.len_object = self.tracecount
-        self.keys_object = list(range(self.tracecount))
-        self.values_function = self.gen_trace_header
+    def __init__(self, reader):
+        super(HeaderAccessor, self).__init__(reader)
+        self.len_object = self._reader.tracecount
+        self.keys_object = range(self._reader.tracecount)
+        self.values_function = self._reader.gen_trace_header
+        self.array_function = self._reader.gen_trace_headers
+
+    @property
+    def raw(self):
+        """Trace headers as uint8 arrays of the 240 SEG-Y bytes, one row per trace"""
+        return RawHeaderAccessor(self._reader)
+
+class RawHeaderAccessor(Accessor, Mapping):
+    def __init__(self, reader):
+        super(RawHeaderAccessor, self).__init__(reader)
+        self.len_object = self._reader.tracecount
+        self.keys_object = range(self._reader.tracecount)
+        self.values_function = self.read_trace_header
+        self.array_function = self._reader.read_trace_headers
+
+    def read_trace_header(self, index):
+        return self._reader.read_trace_headers([index])[0]
 
 class TraceAccessor(Accessor, Mapping):
-    def __init__(self, file):
-        super(Accessor, self).__init__(file)
-        self.len_object = self.tracecount
-        self.keys_object = list(range(self.tracecount))
-        self.values_function = self.get_trace
+    def __init__(self, reader):
+        super(TraceAccessor, self).__init__(reader)
+        self.len_object = self._reader.tracecount
+        self.keys_object = range(self._reader.tracecount)
+        self.values_function = self._reader.get_trace
+        self.value_shape = (self._reader.n_samples,)
+        self.array_function = self._reader.read_traces
+
+
+class Attributes(Accessor):
+    """File-wide attribute (header word) reading, as segyio's Attributes
+
+    Lazily reads a single header word for every trace in the file. Indexing
+    with an int, a slice or a list of indices reads only the traces asked for.
+    """
+    def __init__(self, reader, field):
+        super(Attributes, self).__init__(reader)
+        self.field = field
+        self.dtype = np.intc
+        self.len_object = self._reader.tracecount
+        self.keys_object = range(self._reader.tracecount)
+        self.values_function = self.read_attribute
+        self.array_function = self.read_attributes
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self[:], dtype=dtype)
+
+    def read_attribute(self, index):
+        return self._reader.read_trace_field(self.field, [index])
+
+    def read_attributes(self, indices):
+        return self._reader.read_trace_field(self.field, indices)
 
 
 class SegyioEmulator(VdsReader):
-    def __init__(self, filename):
-        super(SegyioEmulator, self).__init__(filename)
-        self.iline = InlineAccessor(self._filename)
-        self.xline = CrosslineAccessor(self._filename)
-        self.depth_slice = ZsliceAccessor(self._filename)
-        self.trace = TraceAccessor(self._filename)
-        self.header = HeaderAccessor(self._filename)
-        self.text = self.get_file_text_header()
-        self.bin = self.get_file_binary_header()
+    def __init__(self, filename, cache_size=None):
+        super(SegyioEmulator, self).__init__(filename, cache_size=cache_size)
+        self.iline = InlineAccessor(self)
+        self.xline = CrosslineAccessor(self)
+        self.depth_slice = ZsliceAccessor(self)
+        self.trace = TraceAccessor(self)
+        self.header = HeaderAccessor(self)
         self.unstructured = False
+        self._text = None
+        self._bin = None
+
+    @property
+    def text(self):
+        """The textual file headers, decoded on first use"""
+        if self._text is None:
+            self._text = self.get_file_text_header()
+        return self._text
+
+    @property
+    def bin(self):
+        """The binary file header as a segyio Field, decoded on first use"""
+        if self._bin is None:
+            self._bin = self.get_file_binary_header()
+        return self._bin
+
+    def attributes(self, field):
+        """File-wide attribute (header word) reading
+
+        Parameters
+        ----------
+        field : int or segyio.TraceField
+            The header word
+
+        Returns
+        -------
+        attrs : Attributes
+            A sliceable array_like of header words
+        """
+        return Attributes(self, field)
 
 #   Copyright 2021 Equinor
 #
@@ -0,0 +1,180 @@
+import itertools
+
+import numpy as np
+
+from .read import VdsReader
+
+class VdsArray(object):
+    """Lazy, read-only numpy-like view of the whole VDS volume
+
+    Nothing is read until the array is indexed or converted with
+    numpy.asarray. Indexing supports ints, slices (with any step) and
+    Ellipsis along the (inline, crossline, sample) axes, and is served with
+    one requestVolumeSubset per brick slab of inlines in the bounding box of
+    the selection, split further only where a step skips whole bricks. No
+    more than one slab is held besides the result.
+
+    Like the accessors, the array borrows the reader it is given, or opens,
+    owns and closes its own if given a filename.
+    """
+    dtype = np.dtype(np.float32)
+    ndim = 3
+
+    def __init__(self, reader):
+        if isinstance(reader, VdsReader):
+            self._reader = reader
+            self._owns_reader = False
+        else:
+            self._reader = VdsReader(reader)
+            self._owns_reader = True
+        self.shape = (self._reader.n_ilines, self._reader.n_xlines, self._reader.n_samples)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._owns_reader:
+            self._reader.close()
+
+    def __repr__(self):
+        return "VdsArray(shape={}, dtype={})".format(self.shape, self.dtype)
+
+    def __len__(self):
+        return self.shape[0]
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    @property
+    def nbytes(self):
+        return self.size * self.dtype.itemsize
+
+    @property
+    def chunks(self):
+        """Brick-aligned chunk sizes along each axis, as dask expects them"""
+        brick = self._reader.brick_size
+        return tuple(tuple(min(brick, n - start) for start in range(0, n, brick)) for n in self.shape)
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self[...], dtype=dtype)
+
+    def _normalize(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        if sum(k is Ellipsis for k in key) > 1:
+            raise IndexError("an index can only have a single ellipsis ('...')")
+        if Ellipsis in key:
+            i = key.index(Ellipsis)
+            key = key[:i] + (slice(None),) * (self.ndim - len(key) + 1) + key[i + 1:]
+        if len(key) > self.ndim:
+            raise IndexError("too many indices for array: array is 3-dimensional, but {} were indexed".format(len(key)))
+        key = key + (slice(None),) * (self.ndim - len(key))
+
+        ranges, squeeze = [], []
+        for axis, (k, n) in enumerate(zip(key, self.shape)):
+            if isinstance(k, slice):
+                ranges.append(range(*k.indices(n)))
+            elif isinstance(k, (int, np.integer)):
+                index = int(k) + n if k < 0 else int(k)
+                if not 0 <= index < n:
+                    raise IndexError("index {} is out of bounds for axis {} with size {}".format(k, axis, n))
+                ranges.append(range(index, index + 1))
+                squeeze.append(axis)
+            else:
+                raise IndexError("VdsArray only supports ints, slices and Ellipsis, not {}".format(type(k).__name__))
+        return ranges, tuple(squeeze)
+
+    def _runs(self, indices, slabs=False):
+        """Splits a sorted range into runs that share bricks, as (position, range) pairs
+
+        With slabs, runs are split at every brick boundary, otherwise only
+        where the step skips whole bricks.
+        """
+        brick_size = self._reader.brick_size
+        if abs(indices.step) < brick_size and not slabs:
+            return [(slice(0, len(indices)), indices)]
+        # With a step of brick_size or more, every selected index lands in a
+        # different brick, so each is read alone
+        runs, position = [], 0
+        for _, run in itertools.groupby(indices, key=lambda index: index // brick_size):
+            n = sum(1 for _ in run)
+            runs.append((slice(position, position + n), indices[position:position + n]))
+            position += n
+        return runs
+
+    def __getitem__(self, key):
+        ranges, squeeze = self._normalize(key)
+        out = np.empty([len(r) for r in ranges], dtype=self.dtype)
+        if out.size == 0:
+            return out.squeeze(axis=squeeze)
+
+        # Read in ascending order, a slab of inlines at a time, then flip the
+        # axes that were asked for backwards
+        ascending = [r if r.step > 0 else r[::-1] for r in ranges]
+        runs = [self._runs(r, slabs=(axis == 0)) for axis, r in enumerate(ascending)]
+        for parts in itertools.product(*runs):
+            positions = tuple(position for position, _ in parts)
+            lo = [r[0] for _, r in parts]
+            hi = [r[-1] + 1 for _, r in parts]
+            block = self._reader.read_subvolume(lo[0], hi[0], lo[1], hi[1], lo[2], hi[2])
+            out[positions] = block[tuple(slice(None, None, r.step) for _, r in parts)]
+
+        flip = tuple(slice(None, None, -1) if r.step < 0 else slice(None) for r in ranges)
+        return out[flip].squeeze(axis=squeeze)
+
+    def to_dask(self):
+        """The volume as a dask array, with one chunk per brick column
+
+        Requires dask. Chunks are read on demand through this array, so
+        reductions over the dask array run out-of-core and in parallel.
+
+        Returns
+        -------
+        array : dask.array.Array, shape (n_ilines, n_xlines, n_samples)
+        """
+        try:
+            import dask.array as da
+        except ImportError:
+            raise ImportError("VdsArray.to_dask() requires dask, install with pip install dask[array]")
+        return da.from_array(self, chunks=self.chunks, lock=False, asarray=False, fancy=False,
+                             meta=np.empty((0, 0, 0), dtype=self.dtype),
+                             name='vds-' + self._reader._filename)
+
+    def to_xarray(self):
+        """The volume as a dask-backed xarray.DataArray with coordinates
+
+        Requires xarray and dask.
+
+        Returns
+        -------
+        array : xarray.DataArray
+            Dimensions iline, xline and sample, with the line numbers and
+            sample times or depths of the file as coordinates
+        """
+        try:
+            import xarray as xr
+        except ImportError:
+            raise ImportError("VdsArray.to_xarray() requires xarray, install with pip install xarray")
+        return xr.DataArray(self.to_dask(),
+                            dims=('iline', 'xline', 'sample'),
+                            coords={'iline': self._reader.ilines,
+                                    'xline': self._reader.xlines,
+                                    'sample': self._reader.samples})
+
+#   Copyright 2021 Equinor
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
@@ -0,0 +1,98 @@
+import numpy as np
+
+
+class RegularAxis:
+    """Constant-time lookup of indices on a regularly sampled axis
+
+    Parameters
+    ----------
+    first : int or float
+        The coordinate of the first sample
+    step : int or float
+        The distance between two consecutive coordinates
+    n : int
+        The number of samples on the axis
+    tolerance : float, optional
+        How far from a grid coordinate, as a fraction of step, a coordinate
+        may be and still match it. Absorbs float round-off on the sample axis
+    """
+    def __init__(self, first, step, n, tolerance=1e-3):
+        self.first = first
+        self.step = step
+        self.n = n
+        self.tolerance = tolerance
+
+    @classmethod
+    def from_coords(cls, coords, **kwargs):
+        """Builds the axis of an array of regularly spaced coordinates"""
+        step = coords[1] - coords[0] if len(coords) > 1 else 1
+        return cls(coords[0], step, len(coords), **kwargs)
+
+    def __len__(self):
+        return self.n
+
+    def __contains__(self, coord):
+        try:
+            self.index(coord)
+        except (IndexError, TypeError, ValueError):
+            return False
+        return True
+
+    def index(self, coord, include_stop=False):
+        """Returns the index of a coordinate
+
+        Parameters
+        ----------
+        coord : int or float
+            The coordinate
+        include_stop : bool, optional
+            Also accept the coordinate one step past the end, returning n
+
+        Returns
+        -------
+        index : int
+        """
+        position = (coord - self.first) / self.step
+        index = int(round(position))
+        stop = self.n + 1 if include_stop else self.n
+        if abs(position - index) > self.tolerance or not 0 <= index < stop:
+            raise IndexError("Coordinate {} not in axis".format(coord))
+        return index
+
+    def indices(self, coords):
+        """Returns the indices of an array of coordinates
+
+        Parameters
+        ----------
+        coords : array_like of int or float
+            The coordinates
+
+        Returns
+        -------
+        indices : numpy.ndarray of int
+        """
+        coords = np.asarray(coords)
+        positions = (coords - self.first) / self.step
+        indices = np.rint(positions).astype(np.int64)
+        bad = (np.abs(positions - indices) > self.tolerance) | (indices < 0) | (indices >= self.n)
+        if bad.any():
+            raise IndexError("Coordinate {} not in axis".format(coords[bad].flat[0]))
+        return indices
+
+    def coords(self):
+        """Returns all coordinates on the axis, as numpy.ndarray"""
+        return self.first + self.step * np.arange(self.n)
+
+#   Copyright 2021 Equinor
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
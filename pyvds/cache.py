@@ -0,0 +1,92 @@
+import threading
+from collections import OrderedDict
+
+
+class LineCache:
+    """Least-recently-used cache of decompressed lines
+
+    Lines are keyed by (axis, index) and evicted oldest-first once the total
+    size of the cached arrays would exceed max_bytes. Cached arrays are made
+    read-only, since the same array is handed out on every hit.
+
+    Parameters
+    ----------
+    max_bytes : int
+        The memory budget of the cache, in bytes
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = int(max_bytes)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lines = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._lines)
+
+    def __contains__(self, key):
+        return key in self._lines
+
+    def get(self, key):
+        """Returns the cached line for key, or None if it is not cached"""
+        with self._lock:
+            line = self._lines.get(key)
+            if line is None:
+                self.misses += 1
+                return None
+            self._lines.move_to_end(key)
+            self.hits += 1
+            return line
+
+    def put(self, key, line):
+        """Caches line under key, evicting the least recently used lines as needed"""
+        if line.nbytes > self.max_bytes:
+            return
+        line.flags.writeable = False
+        with self._lock:
+            if key in self._lines:
+                self.nbytes -= self._lines.pop(key).nbytes
+            while self._lines and self.nbytes + line.nbytes > self.max_bytes:
+                _, evicted = self._lines.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+                self.evictions += 1
+            self._lines[key] = line
+            self.nbytes += line.nbytes
+
+    def clear(self):
+        """Drops all cached lines. Statistics are kept"""
+        with self._lock:
+            self._lines.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        """Returns the hit/miss statistics and current size of the cache
+
+        Returns
+        -------
+        stats : dict
+            hits, misses, evictions, lines, nbytes and max_bytes
+        """
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions,
+                    'lines': len(self._lines),
+                    'nbytes': self.nbytes,
+                    'max_bytes': self.max_bytes}
+
+#   Copyright 2021 Equinor
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
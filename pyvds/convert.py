@@ -0,0 +1,104 @@
+import numpy as np
+
+
+class Conversion:
+    """Converts float32 samples to another dtype, a block at a time
+
+    Values are clipped, scaled and then cast, rounding and saturating for
+    integer types. NaNs become 0 in integer types. The scratch space used is
+    bounded by block_bytes, whatever the size of the data converted.
+
+    Integers wider than 16 bits are computed in float64, as float32 cannot
+    hold their limits. 64-bit integers saturate at the largest float64
+    below their maximum, which float64 cannot hold either.
+
+    OpenVDS can convert to U8 and U16 itself, but quantizes using the value
+    range recorded for the channel, which does not always cover the data, so
+    the conversion is done here instead.
+
+    Parameters
+    ----------
+    dtype : numpy.dtype
+        The type to convert to
+    clip : (float, float), optional
+        Clip values to this range first. For integer dtypes without scale,
+        the range is mapped linearly onto the full range of the type
+    scale : float, optional
+        Multiply values by scale, after clipping
+    """
+    block_bytes = 2**20
+
+    def __init__(self, dtype, clip=None, scale=None):
+        self.dtype = np.dtype(dtype)
+        if self.dtype.kind not in 'iuf':
+            raise ValueError("Can only convert to integer and float types, not {}".format(self.dtype))
+        if clip is not None:
+            clip = tuple(float(x) for x in clip)
+            if len(clip) != 2 or not clip[0] < clip[1]:
+                raise ValueError("clip must be a (low, high) pair with low < high, was {}".format(clip))
+        self.clip = clip
+        self.factor = scale
+        self.offset = None
+        self.limits = None
+        self.work_dtype = np.float32
+        if self.dtype.kind in 'iu':
+            info = np.iinfo(self.dtype)
+            if self.dtype.itemsize > 2:
+                self.work_dtype = np.float64
+            high = float(info.max)
+            if int(high) > info.max:
+                high = np.nextafter(high, 0)
+            self.limits = (float(info.min), high)
+            if clip is not None and scale is None:
+                self.factor = (info.max - info.min) / (clip[1] - clip[0])
+                self.offset = info.min - clip[0] * self.factor
+
+    @classmethod
+    def create(cls, dtype=None, clip=None, scale=None):
+        """Returns the Conversion for these read arguments, None if they ask for plain float32"""
+        if clip is None and scale is None and (dtype is None or np.dtype(dtype) == np.float32):
+            return None
+        return cls(np.float32 if dtype is None else dtype, clip, scale)
+
+    def __call__(self, data, out=None):
+        """Converts data into out, or a new C-contiguous array"""
+        if out is None:
+            out = np.empty(data.shape, dtype=self.dtype)
+        elif out.shape != data.shape:
+            raise ValueError("out has shape {}, expected {}".format(out.shape, data.shape))
+        elif out.dtype != self.dtype:
+            raise ValueError("out has dtype {}, expected {}".format(out.dtype, self.dtype))
+        if data.ndim == 0 or data.size == 0:
+            out[...] = data
+            return out
+
+        itemsize = np.dtype(self.work_dtype).itemsize
+        rows = max(1, self.block_bytes // max(1, data[0].size * itemsize))
+        for start in range(0, len(data), rows):
+            block = np.array(data[start:start + rows], dtype=self.work_dtype)
+            if self.clip is not None:
+                np.clip(block, *self.clip, out=block)
+            if self.factor is not None:
+                block *= self.factor
+            if self.offset is not None:
+                block += self.offset
+            if self.limits is not None:
+                np.rint(block, out=block)
+                np.clip(block, *self.limits, out=block)
+                np.copyto(block, 0, where=np.isnan(block))
+            out[start:start + rows] = block
+        return out
+
+#   Copyright 2021 Equinor
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
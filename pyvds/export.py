@@ -0,0 +1,177 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import openvds
+
+from .read import VdsReader
+
+# Big-endian sample dtypes of the SEG-Y data sample format codes, except
+# 4-byte IBM float (1), which is converted separately
+_SAMPLE_FORMATS = {2: 'i4', 3: 'i2', 5: 'f4', 6: 'f8', 8: 'i1', 9: 'i8', 10: 'u4', 11: 'u2', 12: 'u8', 16: 'u1'}
+
+
+def ieee_to_ibm(samples):
+    """Converts IEEE floats to 4-byte IBM floats
+
+    Parameters
+    ----------
+    samples : array_like of float32
+
+    Returns
+    -------
+    ibm : numpy.ndarray of uint32
+        The IBM float bit patterns, in native byte order. Low bits that do not
+        fit the IBM mantissa are truncated, so IBM floats converted to IEEE
+        convert back exactly. Infinities and NaNs become the largest IBM
+        float of the same sign
+    """
+    bits = np.asarray(samples, dtype=np.float32).view(np.uint32)
+    sign = bits & np.uint32(0x80000000)
+    exponent = ((bits >> 23) & 0xff).astype(np.int32)
+    fraction = (bits & 0x7fffff) | 0x800000
+
+    # The value is fraction / 2**24 * 2**(exponent - 126), and IBM wants
+    # mantissa / 2**24 * 16**(hexponent - 64) with the mantissa shifted down
+    # by 0-3 bits to make the binary exponent a multiple of 4
+    binary = exponent - 126
+    hexponent = -(-binary // 4)
+    mantissa = fraction >> (4 * hexponent - binary).astype(np.uint32)
+    ibm = sign | ((hexponent + 64).astype(np.uint32) << 24) | mantissa
+
+    ibm[exponent == 0] = sign[exponent == 0]
+    special = exponent == 0xff
+    ibm[special] = sign[special] | np.uint32(0x7fffffff)
+    return ibm
+
+
+class _SegyEncoder:
+    """Reads blocks of inlines and encodes them as SEG-Y trace records"""
+    def __init__(self, reader):
+        self.reader = reader
+        layout = reader.layout
+        self.big_endian = (not layout.isMetadataIntAvailable("SEGY", "Endianness")
+                           or layout.getMetadataInt("SEGY", "Endianness") == 0)
+        self.format = self._format(layout)
+        if self.format != 1 and self.format not in _SAMPLE_FORMATS:
+            raise ValueError("Exporting data sample format {} is not supported".format(self.format))
+        self.itemsize = 4 if self.format == 1 else np.dtype(_SAMPLE_FORMATS[self.format]).itemsize
+        self.trace_bytes = 240 + reader.n_samples * self.itemsize
+        u8 = openvds.VolumeDataChannelDescriptor.Format.Format_U8
+        self.header_args = dict(channel=layout.getChannelIndex('SEGYTraceHeader'), format=u8)
+        self.trace_args = (dict(channel=layout.getChannelIndex('Trace'), format=u8)
+                           if layout.getChannelIndex('Trace') >= 0 else None)
+
+    def _format(self, layout):
+        if layout.isMetadataIntAvailable("SEGY", "DataSampleFormatCode"):
+            return layout.getMetadataInt("SEGY", "DataSampleFormatCode")
+        binary = self.reader._metadata.header_blob(layout, "BinaryHeader")
+        return int.from_bytes(binary[24:26], 'big' if self.big_endian else 'little')
+
+    def encode_samples(self, samples):
+        order = '>' if self.big_endian else '<'
+        if self.format == 1:
+            return ieee_to_ibm(samples).astype(order + 'u4').view(np.uint8)
+        dtype = np.dtype(order + _SAMPLE_FORMATS[self.format])
+        if dtype.kind in 'iu':
+            info = np.iinfo(dtype)
+            samples = np.clip(np.rint(samples), info.min, info.max)
+        return samples.astype(dtype).view(np.uint8)
+
+    def encode(self, il0, il1):
+        """Returns inlines il0:il1 as one buffer of trace records, without dead traces"""
+        reader = self.reader
+        n_xlines, n_samples = reader.n_xlines, reader.n_samples
+        samples = reader.read_subvolume(il0, il1, 0, n_xlines, 0, n_samples)
+        headers = reader._request((il0, 0, 0), (il1, n_xlines, 240), None,
+                                  method='to_segy', **self.header_args).data
+
+        records = np.empty(((il1 - il0) * n_xlines, self.trace_bytes), dtype=np.uint8)
+        records[:, :240] = headers.reshape(-1, 240)
+        records[:, 240:] = self.encode_samples(samples.reshape(-1, n_samples)).reshape(len(records), -1)
+        if self.trace_args is not None:
+            live = reader._request((il0, 0, 0), (il1, n_xlines, 1), None,
+                                   method='to_segy', **self.trace_args).data.reshape(-1)
+            if not live.all():
+                records = records[live != 0]
+        return records
+
+
+def to_segy(vds_path, sgy_path, chunk_inlines=None, threads=2, max_chunk_bytes=256 * 2**20):
+    """Writes a VDS file imported from SEG-Y back out as SEG-Y
+
+    The text and binary headers are written as stored in the VDS metadata,
+    followed by the traces and their original trace headers, one block of
+    inlines at a time. Blocks are read and encoded on worker threads ahead
+    of the writer, so at most threads + 1 blocks are held in memory.
+
+    Parameters
+    ----------
+    vds_path : str
+        The path or url of the VDS file
+    sgy_path : str
+        The SEG-Y file to write
+    chunk_inlines : int, optional
+        The number of inlines per block. Defaults to a brick's worth, or as
+        many as fit in max_chunk_bytes if that is less
+    threads : int, optional
+        The number of blocks to read and encode ahead of the writer. 0 does
+        everything on the calling thread
+    max_chunk_bytes : int, optional
+        The size limit of a block when chunk_inlines is not given
+
+    Notes
+    -----
+    Samples are encoded in the data sample format of the original file,
+    converting to IBM float for format 1. Traces the original file did not
+    have, as recorded by the Trace channel, are left out. Extended textual
+    headers are not stored in VDS, so their count in the binary header is
+    zeroed.
+    """
+    with VdsReader(vds_path) as reader:
+        encoder = _SegyEncoder(reader)
+        if chunk_inlines is None:
+            inline_bytes = reader.n_xlines * encoder.trace_bytes
+            chunk_inlines = max(1, min(reader.brick_size, max_chunk_bytes // inline_bytes))
+        blocks = [(il0, min(il0 + chunk_inlines, reader.n_ilines))
+                  for il0 in range(0, reader.n_ilines, chunk_inlines)]
+
+        text = reader._metadata.header_blob(reader.layout, "TextHeader")
+        binary = bytearray(reader._metadata.header_blob(reader.layout, "BinaryHeader"))
+        binary[304:306] = b'\x00\x00'
+
+        with open(sgy_path, 'wb') as f:
+            f.write(text)
+            f.write(binary)
+            if threads < 1:
+                for block in blocks:
+                    f.write(encoder.encode(*block))
+                return
+
+            with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='pyvds-export') as pool:
+                blocks = iter(blocks)
+                pending = deque(pool.submit(encoder.encode, *block) for _, block in zip(range(threads + 1), blocks))
+                try:
+                    while pending:
+                        records = pending.popleft().result()
+                        for block in blocks:
+                            pending.append(pool.submit(encoder.encode, *block))
+                            break
+                        f.write(records)
+                finally:
+                    for future in pending:
+                        future.cancel()
+
+#   Copyright 2021 Equinor
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
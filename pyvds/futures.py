@@ -0,0 +1,71 @@
+import asyncio
+import concurrent.futures
+
+
+class ReadFuture(concurrent.futures.Future):
+    """Future holding the result of a non-blocking read
+
+    Behaves as a concurrent.futures.Future, and can also be awaited directly
+    from a coroutine running in an asyncio event loop.
+    """
+    def __await__(self):
+        return asyncio.wrap_future(self).__await__()
+
+    @classmethod
+    def completed(cls, result):
+        """Returns an already completed future holding result"""
+        future = cls()
+        future.set_result(result)
+        return future
+
+
+def gather(futures, timeout=None):
+    """Waits for many reads to complete
+
+    Parameters
+    ----------
+    futures : iterable of ReadFuture
+        The pending reads, e.g. from VdsReader.read_inline_async
+    timeout : float, optional
+        The number of seconds to wait for all reads to complete
+
+    Returns
+    -------
+    results : list
+        The results of the reads, in the order the futures were given
+    """
+    futures = list(futures)
+    done, not_done = concurrent.futures.wait(futures, timeout=timeout)
+    if not_done:
+        raise concurrent.futures.TimeoutError("{} of {} reads did not complete".format(len(not_done), len(futures)))
+    return [future.result() for future in futures]
+
+
+async def gather_async(futures):
+    """Awaits many reads from an asyncio event loop
+
+    Parameters
+    ----------
+    futures : iterable of ReadFuture
+        The pending reads, e.g. from VdsReader.read_inline_async
+
+    Returns
+    -------
+    results : list
+        The results of the reads, in the order the futures were given
+    """
+    return list(await asyncio.gather(*[asyncio.wrap_future(future) for future in futures]))
+
+#   Copyright 2021 Equinor
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
@@ -0,0 +1,227 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import openvds
+
+from .axis import RegularAxis
+
+
+class VolumeMetadata:
+    """The geometry and SEG-Y headers of a VDS file
+
+    Only the volume shape, brick size and axis ranges are read when opening.
+    The coordinate arrays and the text and binary header blobs are built or
+    fetched the first time they are asked for, and kept. Arrays are
+    read-only, since one VolumeMetadata may be shared by many readers through
+    the metadata cache.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        (n_ilines, n_xlines, n_samples)
+    ranges : list of tuple
+        (min, max, step) of the inline, crossline and sample axes
+    brick_size : int
+        The brick edge length in samples
+    lod_levels : int
+        The number of levels of detail in the file
+    """
+    def __init__(self, shape, ranges, brick_size, lod_levels):
+        self.shape = tuple(shape)
+        self.ranges = ranges
+        self.brick_size = brick_size
+        self.lod_levels = lod_levels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_layout(cls, access_manager, layout):
+        volume_layout = access_manager.getVolumeDataLayout()
+        n_samples, n_xlines, n_ilines = volume_layout.numSamples
+        ranges = []
+        # VDS dimensions are ordered (sample, crossline, inline)
+        for dimension in (2, 1, 0):
+            desc = volume_layout.getAxisDescriptor(dimension)
+            ranges.append((desc.getCoordinateMin(), desc.getCoordinateMax(), desc.getCoordinateStep()))
+        descriptor = layout.getLayoutDescriptor()
+        return cls((n_ilines, n_xlines, n_samples), ranges,
+                   1 << int(descriptor.getBrickSize()),
+                   int(descriptor.getLODLevels()))
+
+    def _memoized(self, name, compute):
+        value = self._values.get(name)
+        if value is None:
+            value = compute()
+            with self._lock:
+                value = self._values.setdefault(name, value)
+        return value
+
+    def _line_numbers(self, dimension):
+        first, last, step = (int(x) for x in self.ranges[dimension])
+        numbers = np.arange(first, last + step, step).astype('intc')
+        numbers.flags.writeable = False
+        return numbers
+
+    def _sample_coords(self):
+        first, last, step = self.ranges[2]
+        samples = np.arange(first, last + step, step).astype('float')
+        samples.flags.writeable = False
+        return samples
+
+    @property
+    def ilines(self):
+        return self._memoized('ilines', lambda: self._line_numbers(0))
+
+    @property
+    def xlines(self):
+        return self._memoized('xlines', lambda: self._line_numbers(1))
+
+    @property
+    def samples(self):
+        return self._memoized('samples', self._sample_coords)
+
+    @property
+    def iline_axis(self):
+        return self._memoized('iline_axis', lambda: RegularAxis.from_coords(self.ilines))
+
+    @property
+    def xline_axis(self):
+        return self._memoized('xline_axis', lambda: RegularAxis.from_coords(self.xlines))
+
+    @property
+    def sample_axis(self):
+        return self._memoized('sample_axis', lambda: RegularAxis.from_coords(self.samples))
+
+    def header_blob(self, layout, name):
+        """Returns the SEGY metadata blob name, e.g. TextHeader, as bytes
+
+        layout is only queried the first time a blob is asked for.
+        """
+        return self._memoized(name, lambda: bytes(layout.getMetadata("SEGY", name, openvds.core.MetadataType.BLOB)))
+
+
+class MetadataCache:
+    """Process-wide least-recently-used cache of VolumeMetadata
+
+    Entries are keyed by the absolute path, modification time and size of
+    the file, so a file that is rewritten in place is read again. Only local
+    files are cached; urls and other non-filesystem paths always miss.
+
+    Parameters
+    ----------
+    max_files : int
+        The number of files to keep metadata for
+    """
+    def __init__(self, max_files):
+        self.max_files = int(max_files)
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(filename):
+        """Returns the cache key of filename, or None if it is not a local file"""
+        try:
+            stat = os.stat(filename)
+        except (OSError, TypeError, ValueError):
+            return None
+        return (os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+
+    def get(self, key):
+        """Returns the cached metadata for key, or None if it is not cached"""
+        with self._lock:
+            metadata = self._entries.get(key)
+            if metadata is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return metadata
+
+    def put(self, key, metadata):
+        """Caches metadata under key, evicting the least recently used file as needed"""
+        with self._lock:
+            self._entries[key] = metadata
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_files:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drops all cached metadata. Statistics are kept"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Returns the hit/miss statistics and current size of the cache
+
+        Returns
+        -------
+        stats : dict
+            hits, misses, files and max_files
+        """
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'files': len(self._entries),
+                    'max_files': self.max_files}
+
+
+_cache = None
+
+def enable_metadata_cache(max_files=256):
+    """Shares file metadata between all readers of the same file in this process
+
+    Once enabled, reopening a local file that has not changed since it was
+    last opened skips querying the axis descriptors and decoding the headers.
+
+    Parameters
+    ----------
+    max_files : int, optional
+        The number of files to keep metadata for
+
+    Returns
+    -------
+    cache : MetadataCache
+        The process-wide cache, e.g. for its stats()
+    """
+    global _cache
+    _cache = MetadataCache(max_files)
+    return _cache
+
+def disable_metadata_cache():
+    """Turns the process-wide metadata cache off, and drops its contents"""
+    global _cache
+    _cache = None
+
+def load_metadata(filename, access_manager, layout):
+    """Returns the metadata of the opened file filename, from the cache if enabled"""
+    cache = _cache
+    key = MetadataCache.key(filename) if cache is not None else None
+    if key is not None:
+        metadata = cache.get(key)
+        if metadata is not None:
+            return metadata
+    metadata = VolumeMetadata.from_layout(access_manager, layout)
+    if key is not None:
+        cache.put(key, metadata)
+    return metadata
+
+#   Copyright 2021 Equinor
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
@@ -1,8 +1,8 @@
 from .accessors import SegyioEmulator
 
-def open(filename, mode='r'):
+def open(filename, mode='r', cache_size=None):
     assert (mode == 'r')
-    return SegyioEmulator(filename)
+    return SegyioEmulator(filename, cache_size=cache_size)
 
 #   Copyright 2021 Equinor
 #
@@ -0,0 +1,151 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .read import Chunk, VdsReader
+
+
+class ReaderSpec:
+    """Picklable recipe for opening a VdsReader
+
+    A live VdsReader holds an OpenVDS handle and cannot be sent to another
+    process. A ReaderSpec can, and opens its reader lazily on first use in
+    whichever process it ends up in, then keeps it open for later calls.
+
+    Parameters
+    ----------
+    filename : str
+        The path or url of the VDS file
+    **kwargs
+        Passed on to VdsReader, e.g. cache_size
+    """
+    def __init__(self, filename, **kwargs):
+        self.filename = filename
+        self.kwargs = kwargs
+        self._reader = None
+
+    def __getstate__(self):
+        return {'filename': self.filename, 'kwargs': self.kwargs, '_reader': None}
+
+    @property
+    def reader(self):
+        """The VdsReader of this process, opened on first access"""
+        if self._reader is None:
+            self._reader = VdsReader(self.filename, **self.kwargs)
+        return self._reader
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+
+def partition(reader, parts=None):
+    """Splits the survey into brick-aligned inline ranges
+
+    Parameters
+    ----------
+    reader : VdsReader
+    parts : int, optional
+        The number of ranges to make. Whole brick rows are spread as evenly
+        as possible over them. Defaults to one range per brick row
+
+    Returns
+    -------
+    ranges : list of (int, int)
+        The (start, stop) inline indices of each range, covering the survey
+    """
+    edges = reader._brick_edges(0, reader.n_ilines)
+    if parts is not None and parts < len(edges) - 1:
+        groups = np.array_split(np.arange(len(edges) - 1), parts)
+        edges = [edges[group[0]] for group in groups if len(group)] + [edges[-1]]
+    return list(zip(edges, edges[1:]))
+
+
+# Per-process state of the pool workers, set up by _init_worker
+_worker = {}
+
+def _init_worker(spec, fn, out):
+    _worker['spec'] = spec
+    _worker['fn'] = fn
+    _worker['out'] = out
+
+def _map_range(start, stop):
+    reader = _worker['spec'].reader
+    index = (slice(start, stop), slice(0, reader.n_xlines), slice(0, reader.n_samples))
+    data = reader.read_subvolume(start, stop, 0, reader.n_xlines, 0, reader.n_samples)
+    result = _worker['fn'](Chunk(index, reader.ilines[start:stop], reader.xlines, reader.samples, data))
+
+    if _worker['out'] is None:
+        return result
+    filename, dtype, shape, offset = _worker['out']
+    out = np.memmap(filename, dtype=dtype, mode='r+', shape=shape, offset=offset)
+    out[start:stop] = result
+    out.flush()
+
+
+def map_chunks(fn, source, processes=None, out=None, parts=None, mp_context='spawn'):
+    """Runs fn over the whole survey in a pool of processes
+
+    The survey is split into brick-aligned inline ranges by partition(), and
+    every worker process opens the file once and reads its ranges.
+
+    Parameters
+    ----------
+    fn : callable
+        Called with one pyvds.read.Chunk per inline range, returning an array
+        with one row per inline of the chunk. Must be picklable, i.e. defined
+        at module level
+    source : str or ReaderSpec
+        The VDS file to read
+    processes : int, optional
+        The number of worker processes. Defaults to the number of CPUs
+    out : numpy.memmap, optional
+        Array the results are written into, at their inline positions, by
+        the workers themselves. Use a file in /dev/shm to share memory
+        instead of disk. Without it, results are sent back and concatenated
+    parts : int, optional
+        The number of inline ranges, see partition()
+    mp_context : str, optional
+        The multiprocessing start method. Defaults to spawn, as forking a
+        process that has OpenVDS threads running is not safe
+
+    Returns
+    -------
+    result : numpy.ndarray
+        out if given, else the concatenated results
+    """
+    spec = source if isinstance(source, ReaderSpec) else ReaderSpec(source)
+    with VdsReader(spec.filename, **spec.kwargs) as reader:
+        ranges = partition(reader, parts)
+
+    out_spec = None
+    if out is not None:
+        if not isinstance(out, np.memmap):
+            raise TypeError("out must be a numpy.memmap, so worker processes can write to it")
+        out.flush()
+        out_spec = (out.filename, out.dtype, out.shape, out.offset)
+
+    context = multiprocessing.get_context(mp_context)
+    with ProcessPoolExecutor(processes, mp_context=context, initializer=_init_worker,
+                             initargs=(spec, fn, out_spec)) as pool:
+        results = list(pool.map(_map_range, *zip(*ranges)))
+
+    if out is not None:
+        return out
+    return np.concatenate(results, axis=0)
+
+#   Copyright 2021 Equinor
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
@@ -0,0 +1,247 @@
+import threading
+import time
+from collections import OrderedDict
+
+from .accessors import SegyioEmulator
+
+
+class _Entry:
+    def __init__(self):
+        self.reader = None
+        self.error = None
+        self.refs = 0
+        self.last_used = time.monotonic()
+        self.ready = threading.Event()
+
+
+class Lease:
+    """A reader borrowed from a ReaderPool
+
+    Use as a context manager, which gives the reader and hands it back to
+    the pool on exit, or call release() when done. The reader must not be
+    used after it is released, nor closed by the borrower.
+    """
+    def __init__(self, pool, filename, reader):
+        self._pool = pool
+        self.filename = filename
+        self.reader = reader
+        self._released = False
+
+    def __enter__(self):
+        return self.reader
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def release(self):
+        """Hands the reader back to the pool. Safe to call more than once"""
+        if not self._released:
+            self._released = True
+            self._pool._release(self.filename)
+
+
+class ReaderPool:
+    """Thread-safe pool of open readers, shared between callers
+
+    Readers are opened on first use and kept open after they are released,
+    so later opens of the same file skip openvds.open. Every lease holds a
+    reference; a reader is only closed once nobody holds it, either to make
+    room for another file (least recently used first) or because it has been
+    idle for longer than idle_timeout.
+
+    Parameters
+    ----------
+    max_open : int, optional
+        The most readers to keep open at once. When every open reader is
+        leased, opening another file waits for one to be released
+    idle_timeout : float, optional
+        Close readers that have not been leased for this many seconds. Idle
+        readers are closed on the next open() or release(), or by prune()
+    reader_class : type, optional
+        The reader to open files with, SegyioEmulator by default
+    **reader_args
+        Passed on to reader_class, e.g. cache_size
+
+    Examples
+    --------
+    >>> pool = pyvds.ReaderPool(max_open=32, idle_timeout=300)
+    >>> with pool.open(path) as f:
+    ...     inline = f.iline[1234]
+    """
+    def __init__(self, max_open=64, idle_timeout=None, reader_class=SegyioEmulator, **reader_args):
+        if max_open < 1:
+            raise ValueError("max_open must be at least 1, was {}".format(max_open))
+        self.max_open = max_open
+        self.idle_timeout = idle_timeout
+        self.reader_class = reader_class
+        self.reader_args = reader_args
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, filename):
+        return filename in self._entries
+
+    def open(self, filename, timeout=None):
+        """Leases the reader of filename, opening it if it is not already open
+
+        Parameters
+        ----------
+        filename : str
+            The path or url of the VDS file
+        timeout : float, optional
+            How long to wait for a free slot when max_open readers are all
+            leased. Waits indefinitely by default
+
+        Returns
+        -------
+        lease : Lease
+            Gives the reader when entered as a context manager
+        """
+        idle = []
+        try:
+            with self._lock:
+                if self._closed:
+                    raise ValueError("I/O operation on closed pool")
+                idle += self._expire()
+                if filename not in self._entries:
+                    self._make_room(filename, timeout, idle)
+                # Another thread may have opened filename while this one waited for room
+                entry = self._entries.get(filename)
+                if entry is not None:
+                    self.hits += 1
+                    self._entries.move_to_end(filename)
+                    entry.refs += 1
+                    opening = False
+                else:
+                    self.misses += 1
+                    entry = _Entry()
+                    entry.refs = 1
+                    self._entries[filename] = entry
+                    opening = True
+        finally:
+            self._close_readers(idle)
+
+        if opening:
+            try:
+                entry.reader = self.reader_class(filename, **self.reader_args)
+            except BaseException as e:
+                entry.error = e
+                with self._lock:
+                    del self._entries[filename]
+                    self._released.notify_all()
+                raise
+            finally:
+                entry.ready.set()
+        else:
+            entry.ready.wait()
+            if entry.error is not None:
+                raise entry.error
+
+        return Lease(self, filename, entry.reader)
+
+    def _make_room(self, filename, timeout, evicted):
+        """Evicts idle readers into evicted until there is room for filename, or
+        another thread has opened it. Called with the lock held"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while filename not in self._entries and len(self._entries) >= self.max_open:
+            for name, entry in self._entries.items():
+                if entry.refs == 0:
+                    evicted.append(self._entries.pop(name).reader)
+                    self.evictions += 1
+                    break
+            else:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("All {} pooled readers are leased".format(self.max_open))
+                self._released.wait(remaining)
+                if self._closed:
+                    raise ValueError("I/O operation on closed pool")
+
+    def _expire(self):
+        """Removes readers idle for longer than idle_timeout. Called with the lock held"""
+        if self.idle_timeout is None:
+            return []
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = [filename for filename, entry in self._entries.items()
+                   if entry.refs == 0 and entry.last_used < cutoff]
+        return [self._entries.pop(filename).reader for filename in expired]
+
+    @staticmethod
+    def _close_readers(readers):
+        for reader in readers:
+            reader.close()
+
+    def _release(self, filename):
+        with self._lock:
+            entry = self._entries.get(filename)
+            closing = []
+            if entry is not None:
+                entry.refs -= 1
+                entry.last_used = time.monotonic()
+                if entry.refs == 0 and self._closed:
+                    closing.append(self._entries.pop(filename).reader)
+            closing += self._expire()
+            self._released.notify_all()
+        self._close_readers(closing)
+
+    def prune(self):
+        """Closes the readers that have been idle for longer than idle_timeout"""
+        with self._lock:
+            expired = self._expire()
+        self._close_readers(expired)
+
+    def close(self):
+        """Closes all idle readers, and leased readers as they are released
+
+        The pool cannot be opened from afterwards. Safe to call more than once
+        """
+        with self._lock:
+            self._closed = True
+            idle = [filename for filename, entry in self._entries.items() if entry.refs == 0]
+            readers = [self._entries.pop(filename).reader for filename in idle]
+            self._released.notify_all()
+        self._close_readers(readers)
+
+    def stats(self):
+        """Returns the hit/miss statistics and current contents of the pool
+
+        Returns
+        -------
+        stats : dict
+            hits, misses, evictions, open (readers) and leased (readers with
+            at least one lease)
+        """
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions,
+                    'open': len(self._entries),
+                    'leased': sum(entry.refs > 0 for entry in self._entries.values())}
+
+#   Copyright 2021 Equinor
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
@@ -1,51 +1,157 @@
+import itertools
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import openvds
 import segyio
 from segyio import _segyio
 
+from .axis import RegularAxis
+from .cache import LineCache
+from . import statistics
+from .convert import Conversion
+from .futures import ReadFuture
+from .metadata import load_metadata
+from .stats import RequestStats, TimedRequest
+from .sweep import Sweep
+
+_TRACE_FIELDS = sorted(int(field) for field in segyio.TraceField.enums())
+# Header words are 2 or 4 bytes wide, running up to the next word (or byte 240)
+_TRACE_FIELD_SIZES = dict(zip(_TRACE_FIELDS, np.diff(_TRACE_FIELDS + [241]).tolist()))
+
+Chunk = namedtuple('Chunk', ['index', 'ilines', 'xlines', 'samples', 'data'])
+Chunk.__doc__ = """A block of the volume, as yielded by VdsReader.iter_chunks
+
+index is a tuple of (inline, crossline, sample) slices locating data in the
+full volume, and ilines, xlines and samples are the chunk's axis coordinates.
+"""
+
 class VdsReader:
-    def __init__(self, filename):
+    """Reads a VDS file
+
+    Parameters
+    ----------
+    filename : str
+        The path or url of the VDS file
+    cache_size : int, optional
+        If given, keep up to this many bytes of recently read inlines,
+        crosslines and zslices in memory, see pyvds.cache.LineCache.
+        Lines served from the cache are read-only arrays
+
+    Notes
+    -----
+    The line and subvolume reads take these options in common:
+
+    lod : int
+        Level of detail to read at. Level n is decimated by 2**n along every
+        axis, see lod_axes() for the coordinates of the result. Lines are
+        given by full-resolution index, and read as the decimated line they
+        fall in. Reads of several lines return every such decimated line
+        once, so read_inlines(0, n_ilines, lod=n) gives the inlines of
+        lod_axes(n)
+
+    order : str
+        The axis order of the result as the letters i (inline), x (crossline)
+        and s (sample), any permutation of the natural order of the method:
+        'xs' for inlines, 'is' for crosslines, 'ix' for zslices and 'ixs' for
+        subvolumes, e.g. 'sx' for sample-major inlines. Reads of several lines
+        keep the lines first, and reorder the axes within every line. The
+        result is C-contiguous in that order, transposed in the one copy out
+        of the OpenVDS buffer, and out, where taken, must have its shape
+
+    dtype : numpy.dtype
+        The type of the result, e.g. numpy.float16 or numpy.uint8, see
+        pyvds.convert.Conversion. Samples are converted a block at a time as
+        they are read, so no float32 copy of the whole result is made. out,
+        where taken, must be of this type
+
+    clip : (float, float)
+        Clip values to this range before converting. For integer dtypes
+        without scale, the range is mapped linearly onto the full range of
+        the type
+
+    scale : float
+        Multiply values by scale, after clipping
+    """
+    def __init__(self, filename, cache_size=None):
         self._filename = filename
+        self.cache = LineCache(cache_size) if cache_size else None
+        self.stats = None
+        self._sweeps = threading.local()
+        self._executor = None
+        self._executor_lock = threading.Lock()
         self.filehandle = openvds.open(self._filename)
         self.access_manager = openvds.getAccessManager(self.filehandle)
         self.layout = openvds.getLayout(self.filehandle)
-        self.n_samples, self.n_xlines, self.n_ilines = self.access_manager.getVolumeDataLayout().numSamples
+        self._metadata = load_metadata(self._filename, self.access_manager, self.layout)
+        self.n_ilines, self.n_xlines, self.n_samples = self._metadata.shape
         self.tracecount = self.n_xlines * self.n_ilines
+        self.brick_size = self._metadata.brick_size
+        self.lod_levels = self._metadata.lod_levels
+
+    # The coordinate arrays are only built on first use, and are read-only
+    # since they may be shared with other readers of the same file
+
+    @property
+    def ilines(self):
+        """Inline numbers, numpy.ndarray of intc"""
+        return self._metadata.ilines
 
-        il_desc = self.access_manager.getVolumeDataLayout().getAxisDescriptor(2)
-        self.ilines = np.arange(int(il_desc.getCoordinateMin()),
-                                int(il_desc.getCoordinateMax())+int(il_desc.getCoordinateStep()),
-                                int(il_desc.getCoordinateStep())).astype('intc')
+    @property
+    def xlines(self):
+        """Crossline numbers, numpy.ndarray of intc"""
+        return self._metadata.xlines
 
-        xl_desc = self.access_manager.getVolumeDataLayout().getAxisDescriptor(1)
-        self.xlines = np.arange(int(xl_desc.getCoordinateMin()),
-                                int(xl_desc.getCoordinateMax())+int(xl_desc.getCoordinateStep()),
-                                int(xl_desc.getCoordinateStep())).astype('intc')
+    @property
+    def samples(self):
+        """Sample times or depths, numpy.ndarray of float"""
+        return self._metadata.samples
 
-        samp_dec = self.access_manager.getVolumeDataLayout().getAxisDescriptor(0)
-        self.samples = np.arange(samp_dec.getCoordinateMin(),
-                                 samp_dec.getCoordinateMax()+samp_dec.getCoordinateStep(),
-                                 samp_dec.getCoordinateStep()).astype('float')
+    @property
+    def iline_axis(self):
+        return self._metadata.iline_axis
+
+    @property
+    def xline_axis(self):
+        return self._metadata.xline_axis
+
+    @property
+    def sample_axis(self):
+        return self._metadata.sample_axis
 
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        openvds.close(self.filehandle)
+        self.close()
+
+    def close(self):
+        """Closes the underlying OpenVDS handle. Safe to call more than once"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self.filehandle is not None:
+            openvds.close(self.filehandle)
+            self.filehandle = None
 
     @staticmethod
     def coord_to_index(coord, coords, include_stop=False):
-        try:
-            index = np.where(coords == coord)[0][0]
-        except:
-            if include_stop and (coord == coords[-1] + (coords[-1] - coords[-2])):
-                return len(coords)
+        """Returns the index of coord in the regularly spaced array coords
+
+        The index is computed from the first coordinate and the spacing, and
+        only verified against coords, so the lookup is constant-time.
+        """
+        index = RegularAxis.from_coords(coords).index(coord, include_stop)
+        if index < len(coords) and not np.isclose(coords[index], coord):
             raise IndexError("Coordinate {} not in axis".format(coord))
         return index
 
 
-    def read_inline_number(self, il_no):
+    def read_inline_number(self, il_no, out=None, lod=0, order=None, dtype=None, clip=None, scale=None):
         """Reads one inline from VDS file
 
         Parameters
@@ -53,14 +159,29 @@ class VdsReader:
         il_no : int
             The inline number
 
+        out : numpy.ndarray, optional
+            Array of the shape of the result to read into, e.g. a reused
+            buffer or a numpy.memmap. Decompressed straight into it if it is
+            C-contiguous float32 and neither order nor dtype is given
+
+        lod : int, optional
+            Level of detail to read at, see VdsReader
+
+        order : str, optional
+            The axis order of the result, a permutation of 'xs', see VdsReader
+
+        dtype, clip, scale : optional
+            Convert the samples, see VdsReader
+
         Returns
         -------
-        inline : numpy.ndarray of float32, shape: (n_xlines, n_samples)
-            The specified inline, decompressed
+        inline : numpy.ndarray
+            The specified inline, decompressed. Of shape (n_xlines, n_samples)
+            and float32, unless changed by lod, order or dtype
         """
-        return self.read_inline(self.coord_to_index(il_no, self.ilines))
+        return self.read_inline(self.iline_axis.index(il_no), out, lod, order, dtype, clip, scale)
 
-    def read_inline(self, il_idx):
+    def read_inline(self, il_idx, out=None, lod=0, order=None, dtype=None, clip=None, scale=None):
         """Reads one inline from VDS file
 
         Parameters
@@ -68,17 +189,30 @@ class VdsReader:
         il_id : int
             The ordinal number of the inline in the file
 
+        out : numpy.ndarray, optional
+            Array of the shape of the result to read into, e.g. a reused
+            buffer or a numpy.memmap. Decompressed straight into it if it is
+            C-contiguous float32 and neither order nor dtype is given
+
+        lod : int, optional
+            Level of detail to read at, see VdsReader
+
+        order : str, optional
+            The axis order of the result, a permutation of 'xs', see VdsReader
+
+        dtype, clip, scale : optional
+            Convert the samples, see VdsReader
+
         Returns
         -------
-        inline : numpy.ndarray of float32, shape: (n_xlines, n_samples)
-            The specified inline, decompressed
+        inline : numpy.ndarray
+            The specified inline, decompressed. Of shape (n_xlines, n_samples)
+            and float32, unless changed by lod, order or dtype
         """
-        req = self.access_manager.requestVolumeSubset(min=(0, 0, il_idx),
-                                                      max=(self.n_samples, self.n_xlines, il_idx+1))
-        return req.data.reshape((self.n_xlines, self.n_samples))
+        return self._read_line(0, il_idx, out, lod, order, Conversion.create(dtype, clip, scale))
 
 
-    def read_crossline_number(self, xl_no):
+    def read_crossline_number(self, xl_no, out=None, lod=0, order=None, dtype=None, clip=None, scale=None):
         """Reads one crossline from VDS file
 
         Parameters
@@ -86,14 +220,29 @@ class VdsReader:
         xl_no : int
             The crossline number
 
+        out : numpy.ndarray, optional
+            Array of the shape of the result to read into, e.g. a reused
+            buffer or a numpy.memmap. Decompressed straight into it if it is
+            C-contiguous float32 and neither order nor dtype is given
+
+        lod : int, optional
+            Level of detail to read at, see VdsReader
+
+        order : str, optional
+            The axis order of the result, a permutation of 'is', see VdsReader
+
+        dtype, clip, scale : optional
+            Convert the samples, see VdsReader
+
         Returns
         -------
-        crossline : numpy.ndarray of float32, shape: (n_ilines, n_samples)
-            The specified crossline, decompressed
+        crossline : numpy.ndarray
+            The specified crossline, decompressed. Of shape (n_ilines,
+            n_samples) and float32, unless changed by lod, order or dtype
         """
-        return self.read_crossline(self.coord_to_index(xl_no, self.xlines))
+        return self.read_crossline(self.xline_axis.index(xl_no), out, lod, order, dtype, clip, scale)
 
-    def read_crossline(self, xl_idx):
+    def read_crossline(self, xl_idx, out=None, lod=0, order=None, dtype=None, clip=None, scale=None):
         """Reads one crossline from VDS file
 
         Parameters
@@ -101,17 +250,30 @@ class VdsReader:
         xl_id : int
             The ordinal number of the crossline in the file
 
+        out : numpy.ndarray, optional
+            Array of the shape of the result to read into, e.g. a reused
+            buffer or a numpy.memmap. Decompressed straight into it if it is
+            C-contiguous float32 and neither order nor dtype is given
+
+        lod : int, optional
+            Level of detail to read at, see VdsReader
+
+        order : str, optional
+            The axis order of the result, a permutation of 'is', see VdsReader
+
+        dtype, clip, scale : optional
+            Convert the samples, see VdsReader
+
         Returns
         -------
-        crossline : numpy.ndarray of float32, shape: (n_ilines, n_samples)
-            The specified crossline, decompressed
+        crossline : numpy.ndarray
+            The specified crossline, decompressed. Of shape (n_ilines,
+            n_samples) and float32, unless changed by lod, order or dtype
         """
-        req = self.access_manager.requestVolumeSubset(min=(0, xl_idx, 0),
-                                                      max=(self.n_samples, xl_idx+1, self.n_ilines))
-        return req.data.reshape((self.n_ilines, self.n_samples))
+        return self._read_line(1, xl_idx, out, lod, order, Conversion.create(dtype, clip, scale))
 
 
-    def read_zslice_coord(self, samp_no):
+    def read_zslice_coord(self, samp_no, out=None, lod=0, order=None, dtype=None, clip=None, scale=None):
         """Reads one zslice from VDS file (time or depth, depending on file contents)
 
         Parameters
@@ -119,14 +281,30 @@ class VdsReader:
         zslice_no : int
             The sample time/depth to return a zslice from
 
+        out : numpy.ndarray, optional
+            Array of the shape of the result to read into, e.g. a reused
+            buffer or a numpy.memmap. Decompressed straight into it if it is
+            C-contiguous float32 and neither order nor dtype is given
+
+        lod : int, optional
+            Level of detail to read at, see VdsReader
+
+        order : str, optional
+            The axis order of the result, a permutation of 'ix', see VdsReader
+
+        dtype, clip, scale : optional
+            Convert the samples, see VdsReader
+
         Returns
         -------
-        zslice : numpy.ndarray of float32, shape: (n_ilines, n_xlines)
-            The specified zslice (time or depth, depending on file contents), decompressed
+        zslice : numpy.ndarray
+            The specified zslice (time or depth, depending on file contents),
+            decompressed. Of shape (n_ilines, n_xlines) and float32, unless
+            changed by lod, order or dtype
         """
-        return self.read_zslice(self.coord_to_index(samp_no, self.samples))
+        return self.read_zslice(self.sample_axis.index(samp_no), out, lod, order, dtype, clip, scale)
 
-    def read_zslice(self, z_idx):
+    def read_zslice(self, z_idx, out=None, lod=0, order=None, dtype=None, clip=None, scale=None):
         """Reads one zslice from VDS file (time or depth, depending on file contents)
 
         Parameters
@@ -134,17 +312,519 @@ class VdsReader:
         zslice_id : int
             The ordinal number of the zslice in the file
 
+        out : numpy.ndarray, optional
+            Array of the shape of the result to read into, e.g. a reused
+            buffer or a numpy.memmap. Decompressed straight into it if it is
+            C-contiguous float32 and neither order nor dtype is given
+
+        lod : int, optional
+            Level of detail to read at, see VdsReader
+
+        order : str, optional
+            The axis order of the result, a permutation of 'ix', see VdsReader
+
+        dtype, clip, scale : optional
+            Convert the samples, see VdsReader
+
+        Returns
+        -------
+        zslice : numpy.ndarray
+            The specified zslice (time or depth, depending on file contents),
+            decompressed. Of shape (n_ilines, n_xlines) and float32, unless
+            changed by lod, order or dtype
+        """
+        return self._read_line(2, z_idx, out, lod, order, Conversion.create(dtype, clip, scale))
+
+
+    def _check_lod(self, lod):
+        if not 0 <= lod <= self.lod_levels:
+            raise ValueError("Level of detail {} not in file, which has levels 0 to {}".format(lod, self.lod_levels))
+
+    @staticmethod
+    def _lod_shape(lo, hi, lod):
+        """Returns the shape of the voxels lo:hi at level of detail lod
+
+        OpenVDS returns ceil((hi - lo) / 2**lod) decimated voxels along each
+        axis, starting with the one at lo >> lod
+        """
+        return tuple(-(-(h - l) >> lod) if h > l else 0 for l, h in zip(lo, hi))
+
+    def _lod_pieces(self, start, stop, size, lod):
+        """Splits start:stop along an axis of size voxels at brick edges
+
+        Returns (lo, hi, offset) for every piece, where reading lo:hi at lod
+        gives the decimated voxels at offset in the result of reading
+        start:stop whole. Pieces are split on whole decimated voxels, so they
+        line up with it also when start is not a multiple of 2**lod.
+        """
+        first = start >> lod
+        last = first + (-(-(stop - start) >> lod))
+        step = max(1, self.brick_size >> lod)
+        edges = [first] + list(range((first // step + 1) * step, last, step)) + [last]
+        return [(max(a << lod, start), min(b << lod, size), a - first) for a, b in zip(edges, edges[1:])]
+
+    def lod_axes(self, lod):
+        """Returns the axis coordinates of the volume at a level of detail
+
+        Parameters
+        ----------
+        lod : int
+            The level of detail
+
         Returns
         -------
-        zslice : numpy.ndarray of float32, shape: (n_ilines, n_xlines)
-            The specified zslice (time or depth, depending on file contents), decompressed
+        ilines, xlines, samples : numpy.ndarray
+            The coordinates of the first full-resolution sample in each
+            decimated voxel
+        """
+        self._check_lod(lod)
+        step = 1 << lod
+        return self.ilines[::step], self.xlines[::step], self.samples[::step]
+
+    def sweep(self, axis):
+        """Hints that lines along axis will be read in order, e.g. to render every crossline
+
+        Use as a context manager. Within it, single line reads along axis keep
+        the brick slab of the current line resident, so consecutive lines are
+        copied from memory instead of decompressing the same bricks again,
+        and a sweep over the whole volume decompresses each brick once. The
+        slab holds brick_size lines of the full other two axes. A sweep only
+        applies to reads from the thread that entered it, so threads sharing
+        the reader, e.g. through a pyvds.pool.ReaderPool, each sweep their own.
+
+        Parameters
+        ----------
+        axis : {'iline', 'xline', 'zslice'}
+            The axis of the lines swept
+
+        Returns
+        -------
+        sweep : pyvds.sweep.Sweep
+
+        Examples
+        --------
+        >>> with reader.sweep('xline'):
+        ...     for xl in range(reader.n_xlines):
+        ...         render(reader.read_crossline(xl))
+        """
+        return Sweep(self, axis)
+
+    def _sweep_stack(self):
+        """Returns the sweeps entered in the calling thread, innermost last"""
+        stack = getattr(self._sweeps, 'stack', None)
+        if stack is None:
+            stack = self._sweeps.stack = []
+        return stack
+
+    def _active_sweep(self):
+        stack = self._sweep_stack()
+        return stack[-1] if stack else None
+
+    def enable_stats(self, stats=None):
+        """Records every OpenVDS request this reader makes
+
+        Parameters
+        ----------
+        stats : pyvds.stats.RequestStats, optional
+            Where to record the requests, e.g. one shared with other readers.
+            A new one is made if not given
+
+        Returns
+        -------
+        stats : pyvds.stats.RequestStats
+            Counts, bytes, bricks touched and latency histograms per reader
+            method. Callbacks can be added to it with add_callback()
+        """
+        self.stats = stats if stats is not None else RequestStats()
+        return self.stats
+
+    def disable_stats(self):
+        """Stops recording requests"""
+        self.stats = None
+
+    def _bricks_touched(self, lo, hi, lod=0):
+        # A brick at lod covers brick_size << lod full-resolution voxels
+        b = self.brick_size << lod
+        return int(np.prod([(h - 1) // b - l // b + 1 for l, h in zip(lo, hi)]))
+
+    def _request(self, lo, hi, shape, out=None, lod=0, method='request', **request_args):
+        """Requests the voxels lo:hi, given in (inline, crossline, sample) order
+
+        out is validated against shape, and handed to OpenVDS to decompress
+        into if its memory layout allows. lo and hi are full-resolution
+        indices, also when requesting a coarser level of detail. method names
+        the caller in the request stats, if enabled.
         """
-        req = self.access_manager.requestVolumeSubset(min=(z_idx, 0, 0),
-                                                      max=(z_idx+1, self.n_xlines, self.n_ilines))
-        return req.data.reshape((self.n_ilines, self.n_xlines))
+        if lod:
+            self._check_lod(lod)
+        data_out = None
+        if out is not None:
+            if out.shape != tuple(shape):
+                raise ValueError("out has shape {}, expected {}".format(out.shape, tuple(shape)))
+            if out.dtype == np.float32 and out.flags.c_contiguous and out.flags.writeable:
+                data_out = out
+        stats = self.stats
+        if stats is None:
+            # VDS dimensions are ordered (sample, crossline, inline)
+            return self.access_manager.requestVolumeSubset(min=tuple(lo[::-1]), max=tuple(hi[::-1]),
+                                                           data_out=data_out, lod=lod, **request_args)
+        t0 = time.perf_counter()
+        req = self.access_manager.requestVolumeSubset(min=tuple(lo[::-1]), max=tuple(hi[::-1]),
+                                                      data_out=data_out, lod=lod, **request_args)
+        issued = time.perf_counter()
+        return TimedRequest(req, stats, method, lo, hi, lod, self._bricks_touched(lo, hi, lod), issued, issued - t0)
+
+    @staticmethod
+    def _deliver(data, shape, out=None):
+        """Returns data with the given shape, copied into out unless already there"""
+        if out is None:
+            return data if data.shape == tuple(shape) else data.reshape(shape)
+        if data is not out:
+            np.copyto(out, data.reshape(shape))
+        return out
+
+    @staticmethod
+    def _permutation(natural, order):
+        """Returns the transpose taking axes ordered as natural to order, None if they match"""
+        if order is None or order == natural:
+            return None
+        if len(order) != len(natural) or set(order) != set(natural):
+            raise ValueError("order must be a permutation of {!r}, was {!r}".format(natural, order))
+        return tuple(natural.index(axis) for axis in order)
+
+    @staticmethod
+    def _output(data, permutation=None, conversion=None, out=None):
+        """Returns data transposed and converted to a C-contiguous array, or copied into out"""
+        if permutation is not None:
+            data = data.transpose(permutation)
+        if conversion is not None:
+            return conversion(data, out)
+        if out is None:
+            return np.array(data, order='C')
+        if out.shape != data.shape:
+            raise ValueError("out has shape {}, expected {}".format(out.shape, data.shape))
+        np.copyto(out, data)
+        return out
+
+    @staticmethod
+    def _line_order(axis):
+        """Returns the natural axis order of lines along axis, e.g. 'xs' for inlines"""
+        return 'ixs'[:axis] + 'ixs'[axis + 1:]
+
+    @staticmethod
+    def _line_key(axis, index, lod):
+        return (axis, index) if lod == 0 else (axis, index, lod)
+
+    def _read_line(self, axis, index, out=None, lod=0, order=None, conversion=None):
+        """Reads one line along axis, 0 for inline, 1 for crossline and 2 for zslice"""
+        permutation = self._permutation(self._line_order(axis), order)
+        sweep = self._active_sweep()
+        if sweep is not None and sweep.axis == axis and lod == 0:
+            return sweep.read_line(index, lambda line: self._output(line, permutation, conversion, out))
+        if permutation is not None or conversion is not None:
+            return self._output(self._read_line(axis, index, lod=lod), permutation, conversion, out)
+
+        if self.cache is not None:
+            line = self.cache.get(self._line_key(axis, index, lod))
+            if line is not None:
+                return self._deliver(line, line.shape, out)
+
+        return self._finish_line(axis, index, self._request_line(axis, index, out, lod), out, lod)
+
+    def _line_bounds(self, axis, index):
+        lo, hi = [0, 0, 0], [self.n_ilines, self.n_xlines, self.n_samples]
+        lo[axis], hi[axis] = index, index + 1
+        return lo, hi
+
+    def _line_shape(self, axis, lod=0):
+        shape = list(self._lod_shape(*self._line_bounds(axis, 0), lod=lod))
+        del shape[axis]
+        return shape
+
+    def _request_line(self, axis, index, out=None, lod=0):
+        lo, hi = self._line_bounds(axis, index)
+        method = ('read_inline', 'read_crossline', 'read_zslice')[axis]
+        return self._request(lo, hi, self._line_shape(axis, lod), out, lod=lod, method=method)
+
+    def _finish_line(self, axis, index, req, out=None, lod=0):
+        line = self._deliver(req.data, self._line_shape(axis, lod), out)
+        if self.cache is not None:
+            self.cache.put(self._line_key(axis, index, lod), line if out is None else np.array(line))
+        return line
+
+    def _submit(self, req, finish):
+        """Returns a ReadFuture completed with finish() once req is done
+
+        The request is already in flight, a pool thread only waits for it, so
+        any number of requests can be outstanding at once.
+        """
+        future = ReadFuture()
+
+        def complete():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(finish())
+            except BaseException as e:
+                future.set_exception(e)
+
+        self._get_executor().submit(complete)
+        return future
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(thread_name_prefix='pyvds')
+            return self._executor
+
+    def _read_line_async(self, axis, index, lod=0, order=None, conversion=None):
+        sweep = self._active_sweep()
+        if sweep is not None and sweep.axis == axis and lod == 0:
+            # Lines of a sweep are read in order out of the resident slab
+            return ReadFuture.completed(self._read_line(axis, index, lod=lod, order=order, conversion=conversion))
+        permutation = self._permutation(self._line_order(axis), order)
+        if permutation is None and conversion is None:
+            orient = lambda line: line
+        else:
+            orient = lambda line: self._output(line, permutation, conversion)
+        if self.cache is not None:
+            line = self.cache.get(self._line_key(axis, index, lod))
+            if line is not None:
+                return ReadFuture.completed(orient(line))
+        req = self._request_line(axis, index, lod=lod)
+        return self._submit(req, lambda: orient(self._finish_line(axis, index, req, lod=lod)))
+
+    def read_inline_async(self, il_idx, lod=0, order=None, dtype=None, clip=None, scale=None):
+        """Starts reading one inline from VDS file, without waiting for it
+
+        Parameters
+        ----------
+        il_idx : int
+            The ordinal number of the inline in the file
+
+        lod : int, optional
+            Level of detail to read at, see VdsReader
+
+        order : str, optional
+            The axis order of the result, a permutation of 'xs', see VdsReader
+
+        dtype, clip, scale : optional
+            Convert the samples, see VdsReader
+
+        Returns
+        -------
+        future : pyvds.futures.ReadFuture
+            Resolves to the inline as read_inline would return it. May be
+            waited on with result() or awaited from asyncio
+        """
+        return self._read_line_async(0, il_idx, lod, order, Conversion.create(dtype, clip, scale))
+
+    def read_crossline_async(self, xl_idx, lod=0, order=None, dtype=None, clip=None, scale=None):
+        """Starts reading one crossline from VDS file, without waiting for it
+
+        Parameters
+        ----------
+        xl_idx : int
+            The ordinal number of the crossline in the file
+
+        lod : int, optional
+            Level of detail to read at, see VdsReader
+
+        order : str, optional
+            The axis order of the result, a permutation of 'is', see VdsReader
+
+        dtype, clip, scale : optional
+            Convert the samples, see VdsReader
+
+        Returns
+        -------
+        future : pyvds.futures.ReadFuture
+            Resolves to the crossline as read_crossline would return it. May be
+            waited on with result() or awaited from asyncio
+        """
+        return self._read_line_async(1, xl_idx, lod, order, Conversion.create(dtype, clip, scale))
+
+    def read_zslice_async(self, z_idx, lod=0, order=None, dtype=None, clip=None, scale=None):
+        """Starts reading one zslice from VDS file, without waiting for it
+
+        Parameters
+        ----------
+        z_idx : int
+            The ordinal number of the zslice in the file
+
+        lod : int, optional
+            Level of detail to read at, see VdsReader
+
+        order : str, optional
+            The axis order of the result, a permutation of 'ix', see VdsReader
+
+        dtype, clip, scale : optional
+            Convert the samples, see VdsReader
+
+        Returns
+        -------
+        future : pyvds.futures.ReadFuture
+            Resolves to the zslice as read_zslice would return it. May be
+            waited on with result() or awaited from asyncio
+        """
+        return self._read_line_async(2, z_idx, lod, order, Conversion.create(dtype, clip, scale))
+
+    def _read_lines(self, axis, start, stop, step, read_line, out=None, lod=0, order=None, conversion=None):
+        permutation = self._permutation(self._line_order(axis), order)
+        indices = range(start, stop, step)
+        if lod:
+            # The decimated lines the selected lines fall in, each once
+            indices = [index for index, _ in itertools.groupby(index >> lod for index in indices)]
+        line_shape = self._line_shape(axis, lod)
+        if permutation is not None:
+            line_shape = [line_shape[p] for p in permutation]
+            permutation = (0,) + tuple(p + 1 for p in permutation)
+        shape = tuple([len(indices)] + line_shape)
+        if out is None:
+            out = np.empty(shape, dtype=np.float32 if conversion is None else conversion.dtype)
+        elif out.shape != shape:
+            raise ValueError("out has shape {}, expected {}".format(out.shape, shape))
+
+        # Read one brick slab along axis at a time, so no more than a slab is
+        # held besides the result, and copy out only the selected lines
+        per_slab = max(1, self.brick_size >> lod)
+        position = 0
+        for _, group in itertools.groupby(indices, key=lambda index: index // per_slab):
+            group = list(group)
+            part = out[position:position + len(group)]
+            if permutation is None and conversion is None:
+                self._read_line_group(axis, group, read_line, part, lod)
+            else:
+                lines = self._read_line_group(axis, group, read_line, lod=lod)
+                self._output(lines, permutation, conversion, part)
+            position += len(group)
+        return out
+
+    def _read_line_group(self, axis, group, read_line, out=None, lod=0):
+        """Reads the lines at indices group, all in one brick slab along axis
+
+        The indices count decimated lines at lod, and full-resolution lines at 0.
+        """
+        if len(group) == 1:
+            line = read_line(group[0] << lod, out=None if out is None else out[0], lod=lod)
+            return line[np.newaxis] if out is None else out
+
+        if self.cache is not None:
+            cached = [self.cache.get(self._line_key(axis, index << lod, lod)) for index in group]
+            if all(line is not None for line in cached):
+                return np.stack(cached, out=out)
+
+        first, last = min(group), max(group)
+        bounds = [0, self.n_ilines, 0, self.n_xlines, 0, self.n_samples]
+        bounds[2*axis:2*axis+2] = first << lod, min((last + 1) << lod, bounds[2*axis + 1])
+        if axis == 0 and group == list(range(first, last + 1)):
+            # A run of inlines is laid out just like the subvolume
+            lines = self.read_subvolume(*bounds, out=out, lod=lod)
+        else:
+            block = np.moveaxis(self.read_subvolume(*bounds, lod=lod), axis, 0)
+            if out is None:
+                out = np.empty((len(group),) + block.shape[1:], dtype=np.float32)
+            for line, index in zip(out, group):
+                np.copyto(line, block[index - first])
+            lines = out
+
+        if self.cache is not None:
+            for line, index in zip(lines, group):
+                self.cache.put(self._line_key(axis, index << lod, lod), np.array(line))
+        return lines
+
+    def read_inlines(self, start, stop, step=1, out=None, lod=0, order=None, dtype=None, clip=None, scale=None):
+        """Reads several inlines from VDS file, as few requests as possible
+
+        Parameters
+        ----------
+        start, stop, step : int
+            The ordinal numbers of the inlines in the file, as for range()
+
+        out : numpy.ndarray, optional
+            Array of the shape of the result to read into, e.g. a reused
+            buffer or a numpy.memmap
+
+        lod : int, optional
+            Level of detail to read at, see VdsReader
+
+        order : str, optional
+            The axis order of the result, a permutation of 'xs', see VdsReader
+
+        dtype, clip, scale : optional
+            Convert the samples, see VdsReader
+
+        Returns
+        -------
+        inlines : numpy.ndarray
+            The specified inlines, decompressed. Of shape (n, n_xlines,
+            n_samples) and float32, unless changed by lod, order or dtype
+        """
+        return self._read_lines(0, start, stop, step, self.read_inline, out, lod, order,
+                                 Conversion.create(dtype, clip, scale))
+
+    def read_crosslines(self, start, stop, step=1, out=None, lod=0, order=None, dtype=None, clip=None, scale=None):
+        """Reads several crosslines from VDS file, as few requests as possible
+
+        Parameters
+        ----------
+        start, stop, step : int
+            The ordinal numbers of the crosslines in the file, as for range()
+
+        out : numpy.ndarray, optional
+            Array of the shape of the result to read into, e.g. a reused
+            buffer or a numpy.memmap
 
+        lod : int, optional
+            Level of detail to read at, see VdsReader
 
-    def read_subvolume(self, min_il, max_il, min_xl, max_xl, min_z, max_z):
+        order : str, optional
+            The axis order of the result, a permutation of 'is', see VdsReader
+
+        dtype, clip, scale : optional
+            Convert the samples, see VdsReader
+
+        Returns
+        -------
+        crosslines : numpy.ndarray
+            The specified crosslines, decompressed. Of shape (n, n_ilines,
+            n_samples) and float32, unless changed by lod, order or dtype
+        """
+        return self._read_lines(1, start, stop, step, self.read_crossline, out, lod, order,
+                                 Conversion.create(dtype, clip, scale))
+
+    def read_zslices(self, start, stop, step=1, out=None, lod=0, order=None, dtype=None, clip=None, scale=None):
+        """Reads several zslices from VDS file, as few requests as possible
+
+        Parameters
+        ----------
+        start, stop, step : int
+            The ordinal numbers of the zslices in the file, as for range()
+
+        out : numpy.ndarray, optional
+            Array of the shape of the result to read into, e.g. a reused
+            buffer or a numpy.memmap
+
+        lod : int, optional
+            Level of detail to read at, see VdsReader
+
+        order : str, optional
+            The axis order of the result, a permutation of 'ix', see VdsReader
+
+        dtype, clip, scale : optional
+            Convert the samples, see VdsReader
+
+        Returns
+        -------
+        zslices : numpy.ndarray
+            The specified zslices, decompressed. Of shape (n, n_ilines,
+            n_xlines) and float32, unless changed by lod, order or dtype
+        """
+        return self._read_lines(2, start, stop, step, self.read_zslice, out, lod, order,
+                                 Conversion.create(dtype, clip, scale))
+
+
+    def read_subvolume(self, min_il, max_il, min_xl, max_xl, min_z, max_z, out=None, max_workers=None, lod=0, order=None, dtype=None, clip=None, scale=None):
         """Reads a sub-volume from VDS file
 
         Parameters
@@ -164,32 +844,295 @@ class VdsReader:
         max_z : int
             The index of the last time sample to get, non inclusive. To get one time sample, use max_z = min_z + 1
 
+        out : numpy.ndarray, optional
+            Array of the shape of the result to read into, e.g. a reused
+            buffer or a numpy.memmap. Decompressed straight into it if it is
+            C-contiguous float32 and neither order nor dtype is given
+
+        max_workers : int, optional
+            Split the subvolume into brick-aligned (inline, crossline) tiles and
+            read them on a pool of this many threads, into one output array
+
+        lod : int, optional
+            Level of detail to read at, see VdsReader
+
+        order : str, optional
+            The axis order of the result, a permutation of 'ixs', see VdsReader
+
+        dtype, clip, scale : optional
+            Convert the samples, see VdsReader
+
         access_padding : bool, optional
             Functions which manage voxels used for padding themselves may relax bounds-checking to padded dimensions
 
         Returns
         -------
-        subvolume : numpy.ndarray of float32, shape (max_il - min_il, max_xl - min_xl, max_z - min_z)
-            The specified subvolume, decompressed
+        subvolume : numpy.ndarray
+            The specified subvolume, decompressed. Of shape (max_il - min_il,
+            max_xl - min_xl, max_z - min_z) and float32, unless changed by lod,
+            order or dtype
         """
-        req = self.access_manager.requestVolumeSubset(min=(min_z, min_xl, min_il),
-                                                      max=(max_z, max_xl, max_il))
-        return req.data.reshape((max_il-min_il, max_xl-min_xl, max_z-min_z))
+        lo, hi = (min_il, min_xl, min_z), (max_il, max_xl, max_z)
+        permutation = self._permutation('ixs', order)
+        conversion = Conversion.create(dtype, clip, scale)
+        if permutation is not None or conversion is not None:
+            return self._read_subvolume_slabs(lo, hi, out, max_workers, lod, permutation, conversion)
+
+        if max_workers is not None and max_workers > 1:
+            return self._read_subvolume_tiled(lo, hi, out, max_workers, lod)
+        shape = self._lod_shape(lo, hi, lod)
+        req = self._request(lo, hi, shape, out, lod=lod, method='read_subvolume')
+        return self._deliver(req.data, shape, out)
+
+    def _read_subvolume_slabs(self, lo, hi, out, max_workers, lod, permutation, conversion):
+        """Reads a subvolume one brick-aligned slab of inlines at a time, transposing
+        and converting each into out"""
+        shape = self._lod_shape(lo, hi, lod)
+        if permutation is not None:
+            shape = tuple(shape[p] for p in permutation)
+        if out is None:
+            out = np.empty(shape, dtype=np.float32 if conversion is None else conversion.dtype)
+        elif out.shape != shape:
+            raise ValueError("out has shape {}, expected {}".format(out.shape, shape))
+
+        # out seen in (inline, crossline, sample) order
+        natural = out if permutation is None else out.transpose(np.argsort(permutation))
+        for il0, il1, first in self._lod_pieces(lo[0], hi[0], self.n_ilines, lod):
+            slab = self.read_subvolume(il0, il1, lo[1], hi[1], lo[2], hi[2], max_workers=max_workers, lod=lod)
+            self._output(slab, None, conversion, natural[first:first + len(slab)])
+        return out
+
+    def _brick_edges(self, start, stop):
+        """Returns start, every brick boundary between start and stop, and stop"""
+        first = (start // self.brick_size + 1) * self.brick_size
+        return [start] + list(range(first, stop, self.brick_size)) + [stop]
+
+    def _read_subvolume_tiled(self, lo, hi, out, max_workers, lod=0):
+        shape = self._lod_shape(lo, hi, lod)
+        if out is None:
+            out = np.empty(shape, dtype=np.float32)
+        elif out.shape != shape:
+            raise ValueError("out has shape {}, expected {}".format(out.shape, shape))
+
+        def read_tile(il_piece, xl_piece):
+            (il0, il1, il), (xl0, xl1, xl) = il_piece, xl_piece
+            tile_shape = self._lod_shape((il0, xl0, lo[2]), (il1, xl1, hi[2]), lod)
+            tile = out[il:il + tile_shape[0], xl:xl + tile_shape[1]]
+            req = self._request((il0, xl0, lo[2]), (il1, xl1, hi[2]), tile_shape, tile, lod=lod,
+                                method='read_subvolume')
+            self._deliver(req.data, tile_shape, tile)
+
+        il_pieces = self._lod_pieces(lo[0], hi[0], self.n_ilines, lod)
+        xl_pieces = self._lod_pieces(lo[1], hi[1], self.n_xlines, lod)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='pyvds-tile') as pool:
+            tiles = [pool.submit(read_tile, il_piece, xl_piece)
+                     for il_piece in il_pieces
+                     for xl_piece in xl_pieces]
+            for tile in tiles:
+                tile.result()
+        return out
+
+    def read_subvolume_async(self, min_il, max_il, min_xl, max_xl, min_z, max_z, lod=0, order=None,
+                             dtype=None, clip=None, scale=None):
+        """Starts reading a sub-volume from VDS file, without waiting for it
+
+        Takes the same parameters as read_subvolume, except out and max_workers.
+        With order or dtype, the subvolume is read one brick slab of inlines
+        at a time, each slab transposed and converted as it completes while
+        the next is in flight, as read_subvolume does.
 
-    def read_volume(self):
+        Returns
+        -------
+        future : pyvds.futures.ReadFuture
+            Resolves to the subvolume as read_subvolume would return it. May be
+            waited on with result() or awaited from asyncio
+        """
+        lo, hi = (min_il, min_xl, min_z), (max_il, max_xl, max_z)
+        shape = self._lod_shape(lo, hi, lod)
+        permutation = self._permutation('ixs', order)
+        conversion = Conversion.create(dtype, clip, scale)
+        if permutation is not None or conversion is not None:
+            return self._read_subvolume_slabs_async(lo, hi, lod, permutation, conversion)
+        req = self._request(lo, hi, shape, lod=lod, method='read_subvolume_async')
+        return self._submit(req, lambda: self._deliver(req.data, shape))
+
+    def _read_subvolume_slabs_async(self, lo, hi, lod, permutation, conversion):
+        """Starts reading a subvolume one brick-aligned slab of inlines at a time,
+        keeping two slabs in flight and converting each as it completes"""
+        shape = self._lod_shape(lo, hi, lod)
+        if permutation is not None:
+            shape = tuple(shape[p] for p in permutation)
+        out = np.empty(shape, dtype=np.float32 if conversion is None else conversion.dtype)
+        # out seen in (inline, crossline, sample) order
+        natural = out if permutation is None else out.transpose(np.argsort(permutation))
+        pieces = iter(self._lod_pieces(lo[0], hi[0], self.n_ilines, lod))
+
+        def start(piece):
+            il0, il1, first = piece
+            slab_lo, slab_hi = (il0, lo[1], lo[2]), (il1, hi[1], hi[2])
+            slab_shape = self._lod_shape(slab_lo, slab_hi, lod)
+            req = self._request(slab_lo, slab_hi, slab_shape, lod=lod, method='read_subvolume_async')
+            return req, slab_shape, first
+
+        pending = deque(start(piece) for piece in itertools.islice(pieces, 2))
+
+        def finish():
+            while pending:
+                req, slab_shape, first = pending.popleft()
+                pending.extend(start(piece) for piece in itertools.islice(pieces, 1))
+                self._output(req.data.reshape(slab_shape), None, conversion,
+                             natural[first:first + slab_shape[0]])
+            return out
+
+        return self._submit(pending[0][0], finish)
+
+    def read_volume(self, out=None, order=None, dtype=None, clip=None, scale=None):
         """Reads the whole volume from VDS file
 
+        Parameters
+        ----------
+        out : numpy.ndarray, optional
+            Array of the shape of the result to read into, e.g. a reused
+            buffer or a numpy.memmap. Decompressed straight into it if it is
+            C-contiguous float32 and neither order nor dtype is given
+
+        order : str, optional
+            The axis order of the result, a permutation of 'ixs', see VdsReader
+
+        dtype, clip, scale : optional
+            Convert the samples, see VdsReader
+
         Returns
         -------
-        volume : numpy.ndarray of float32, shape (n_ilines, n_xline, n_samples)
-            The whole volume, decompressed
+        volume : numpy.ndarray
+            The whole volume, decompressed. Of shape (n_ilines, n_xline,
+            n_samples) and float32, unless changed by order or dtype
         """
         return self.read_subvolume(0, self.n_ilines,
                                    0, self.n_xlines,
-                                   0, self.n_samples)
+                                   0, self.n_samples, out=out, order=order,
+                                   dtype=dtype, clip=clip, scale=scale)
+
+
+    def iter_chunks(self, chunk_shape=None, prefetch=1):
+        """Reads the whole volume from VDS file, one chunk at a time
+
+        Chunks tile the volume starting at the first inline, crossline and
+        sample, so chunk shapes that are multiples of the brick size keep
+        every request brick-aligned.
+
+        Parameters
+        ----------
+        chunk_shape : tuple of int, optional
+            The (n_ilines, n_xlines, n_samples) shape of each chunk. Defaults
+            to the brick size of the volume along every axis
+        prefetch : int, optional
+            The number of chunks to read ahead in the background
+
+        Yields
+        ------
+        chunk : Chunk
+            The chunk's index bounds, axis coordinates and data, a
+            numpy.ndarray of float32 with shape up to chunk_shape
+        """
+        if chunk_shape is None:
+            chunk_shape = (self.brick_size,) * 3
+        shape = (self.n_ilines, self.n_xlines, self.n_samples)
+        starts = [range(0, n, step) for n, step in zip(shape, chunk_shape)]
+        indices = (tuple(slice(start, min(start + step, n)) for start, step, n in zip(origin, chunk_shape, shape))
+                   for origin in itertools.product(*starts))
+
+        def submit(index):
+            il, xl, z = index
+            future = self.read_subvolume_async(il.start, il.stop, xl.start, xl.stop, z.start, z.stop)
+            return index, future
+
+        pending = deque(submit(index) for index in itertools.islice(indices, prefetch + 1))
+        try:
+            while pending:
+                index, future = pending.popleft()
+                data = future.result()
+                pending.extend(submit(index) for index in itertools.islice(indices, 1))
+                yield Chunk(index, self.ilines[index[0]], self.xlines[index[1]], self.samples[index[2]], data)
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def statistics(self, percentiles=(1, 5, 50, 95, 99), lod=0, sample=None, max_workers=None,
+                   relative_accuracy=0.01, seed=0):
+        """Computes summary statistics of the whole volume without holding it in memory
+
+        The volume is read brick by brick on a pool of threads. Each brick is
+        summarized on its own, and the summaries merged.
+
+        Parameters
+        ----------
+        percentiles : sequence of float, optional
+            The percentiles to estimate, between 0 and 100
+
+        lod : int, optional
+            Compute from this level of detail, for a fast estimate
 
+        sample : float, optional
+            Compute from this fraction of the bricks, picked at random, for a
+            fast estimate
 
-    def get_trace(self, index):
+        max_workers : int, optional
+            The number of threads to read bricks on
+
+        relative_accuracy : float, optional
+            The relative error bound of the percentiles, see
+            pyvds.statistics.QuantileSketch
+
+        seed : int, optional
+            Seed of the random pick of bricks when sampling
+
+        Returns
+        -------
+        statistics : pyvds.statistics.Statistics
+            count, min, max, mean, std, rms and a dict of percentiles
+        """
+        chunks = statistics.brick_chunks(self, sample, seed, lod)
+        summary = statistics.reduce_chunks(self, chunks,
+                                           lambda data: statistics.Summary(relative_accuracy).add(data),
+                                           statistics.Summary.merge,
+                                           lod, max_workers)
+        return summary.result(percentiles)
+
+    def histogram(self, bins=256, range=None, lod=0, sample=None, max_workers=None, seed=0):
+        """Computes a histogram of the whole volume without holding it in memory
+
+        Takes the same lod, sample, max_workers and seed as statistics().
+
+        Parameters
+        ----------
+        bins : int or sequence of float, optional
+            The number of equal-width bins, or the bin edges, as for
+            numpy.histogram
+
+        range : (float, float), optional
+            The range of the bins. Defaults to the min and max of the data,
+            which takes an extra pass over it
+
+        Returns
+        -------
+        counts : numpy.ndarray of int64
+            The number of samples in each bin
+        edges : numpy.ndarray of float
+            The bin edges, one more than counts
+        """
+        chunks = statistics.brick_chunks(self, sample, seed, lod)
+        if np.ndim(bins) == 0 and range is None:
+            range = statistics.reduce_chunks(self, chunks, statistics.value_range, statistics.merge_ranges,
+                                             lod, max_workers)
+        edges = np.histogram_bin_edges([], bins=bins, range=range)
+        counts = statistics.reduce_chunks(self, chunks,
+                                          lambda data: np.histogram(data, bins=edges)[0],
+                                          np.add,
+                                          lod, max_workers)
+        return counts, edges
+
+    def get_trace(self, index, out=None):
         """Reads one trace from VDS file
 
         Parameters
@@ -197,6 +1140,11 @@ class VdsReader:
         index : int
             The ordinal number of the trace in the file
 
+        out : numpy.ndarray, optional
+            Array of shape (n_samples,) to read into, e.g. a reused
+            buffer or a numpy.memmap. Decompressed straight into it if it is
+            C-contiguous float32
+
         Returns
         -------
         trace : numpy.ndarray of float32, shape (n_samples)
@@ -206,9 +1154,16 @@ class VdsReader:
             raise IndexError("Index {} is out of range, total traces is {}".format(index, self.n_ilines * self.n_xlines))
 
         il, xl = index // self.n_xlines, index % self.n_xlines
-        req = self.access_manager.requestVolumeSubset(min=(0, xl, il),
-                                                      max=(self.n_samples, xl+1, il+1))
-        return req.data
+        if self.cache is not None:
+            # A trace is a row of any cached inline or crossline through it
+            inline = self.cache.get((0, il))
+            if inline is not None:
+                return self._deliver(inline[xl], (self.n_samples,), out)
+            crossline = self.cache.get((1, xl))
+            if crossline is not None:
+                return self._deliver(crossline[il], (self.n_samples,), out)
+        req = self._request((il, xl, 0), (il+1, xl+1, self.n_samples), (self.n_samples,), out, method='get_trace')
+        return self._deliver(req.data, (self.n_samples,), out)
 
 
     def gen_trace_header(self, index):
@@ -225,22 +1180,352 @@ class VdsReader:
             A single header as a dictionary of headerword-value pairs
         """
         if not 0 <= index < self.n_ilines * self.n_xlines:
-            raise IndexError(self.range_error.format(index, 0, self.tracecount))
+            raise IndexError("Index {} is out of range, total traces is {}".format(index, self.tracecount))
 
         xl_coord, il_coord = index % self.n_xlines, index // self.n_xlines
 
-        req = self.access_manager.requestVolumeSubset((0,xl_coord,il_coord), (240,xl_coord+1,il_coord+1),
-                                                     channel=self.layout.getChannelIndex('SEGYTraceHeader'),
-                                                     format=openvds.VolumeDataChannelDescriptor.Format.Format_U8)
+        req = self._request((il_coord, xl_coord, 0), (il_coord+1, xl_coord+1, 240), (240,),
+                            method='gen_trace_header',
+                            channel=self.layout.getChannelIndex('SEGYTraceHeader'),
+                            format=openvds.VolumeDataChannelDescriptor.Format.Format_U8)
 
         return segyio.segy.Field(req.data.tobytes(), kind='trace')
 
+    def _trace_blocks(self, il, xl):
+        """Groups sorted trace positions into rectangular (il, xl) blocks
+
+        Consecutive inlines touching the same crossline extent are merged into
+        one block, up to a brick's worth of inlines. Yields (il0, il1, xl0, xl1,
+        begin, end), where begin:end is the block's span of the positions.
+        """
+        starts = np.flatnonzero(np.diff(il)) + 1
+        starts = np.concatenate(([0], starts))
+        ends = np.append(starts[1:], len(il))
+        xl_min = np.minimum.reduceat(xl, starts)
+        xl_max = np.maximum.reduceat(xl, starts) + 1
+
+        block = 0
+        for seg in range(1, len(starts) + 1):
+            if (seg < len(starts)
+                    and il[starts[seg]] == il[starts[seg - 1]] + 1
+                    and xl_min[seg] == xl_min[block]
+                    and xl_max[seg] == xl_max[block]
+                    and il[starts[seg]] - il[starts[block]] < self.brick_size):
+                continue
+            yield (il[starts[block]], il[starts[seg - 1]] + 1,
+                   xl_min[block], xl_max[block],
+                   starts[block], ends[seg - 1])
+            block = seg
+
+    def _read_trace_channel(self, indices, length, dtype, first=0, method='read_traces', **request_args):
+        indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+        out = np.empty((len(indices), length), dtype=dtype)
+        if len(indices) == 0:
+            return out
+        if indices.min() < 0 or indices.max() >= self.tracecount:
+            bad = indices[(indices < 0) | (indices >= self.tracecount)][0]
+            raise IndexError("Index {} is out of range, total traces is {}".format(bad, self.tracecount))
+
+        order = np.argsort(indices, kind='stable')
+        il, xl = np.divmod(indices[order], self.n_xlines)
+        for il0, il1, xl0, xl1, begin, end in self._trace_blocks(il, xl):
+            req = self._request((il0, xl0, first), (il1, xl1, first + length), None,
+                                method=method, **request_args)
+            block = req.data.reshape((il1 - il0, xl1 - xl0, length))
+            out[order[begin:end]] = block[il[begin:end] - il0, xl[begin:end] - xl0]
+        return out
+
+    def read_traces(self, indices):
+        """Reads many traces from VDS file, grouped into few requests
+
+        Parameters
+        ----------
+        indices : array_like of int
+            The ordinal numbers of the traces in the file, in any order
+
+        Returns
+        -------
+        traces : numpy.ndarray of float32, shape (len(indices), n_samples)
+            The specified traces, decompressed
+        """
+        return self._read_trace_channel(indices, self.n_samples, np.float32)
+
+    def _read_nodes(self, il, xl):
+        """Reads the traces at integer (il, xl) index positions
+
+        Positions are deduplicated and grouped by brick column, and each
+        group is fetched with one request for its bounding box.
+        """
+        linear, inverse = np.unique(il * self.n_xlines + xl, return_inverse=True)
+        il, xl = np.divmod(linear, self.n_xlines)
+        columns = (il // self.brick_size) * self.n_xlines + xl // self.brick_size
+        order = np.argsort(columns, kind='stable')
+        starts = np.flatnonzero(np.diff(columns[order])) + 1
+
+        traces = np.empty((len(linear), self.n_samples), dtype=np.float32)
+        for group in np.split(order, starts):
+            il0, il1 = il[group].min(), il[group].max() + 1
+            xl0, xl1 = xl[group].min(), xl[group].max() + 1
+            shape = (il1 - il0, xl1 - xl0, self.n_samples)
+            req = self._request((il0, xl0, 0), (il1, xl1, self.n_samples), shape, method='read_nodes')
+            block = self._deliver(req.data, shape)
+            traces[group] = block[il[group] - il0, xl[group] - xl0]
+        return traces[inverse.reshape(-1)]
+
+    def world_to_index(self, x, y):
+        """Converts world coordinates to fractional (inline, crossline) indices
+
+        Uses the survey's IJK grid definition from the VDS metadata.
+
+        Parameters
+        ----------
+        x, y : array_like of float
+            The world coordinates
+
+        Returns
+        -------
+        il, xl : numpy.ndarray of float
+            The positions in index space, not rounded
+        """
+        grid = self.layout.getVDSIJKGridDefinitionFromMetadata()
+        # The grid's I and J axes are the VDS dimensions named in its dimension map
+        if set(grid.dimensionMap[:2]) != {1, 2}:
+            raise ValueError("World coordinates need a grid with I and J along the inline and crossline "
+                             "dimensions, not VDS dimensions {} and {}".format(*grid.dimensionMap[:2]))
+        basis = np.array([[grid.iUnitStep[0], grid.jUnitStep[0]],
+                          [grid.iUnitStep[1], grid.jUnitStep[1]]])
+        offset = np.stack([np.asarray(x, dtype=float).reshape(-1) - grid.origin[0],
+                           np.asarray(y, dtype=float).reshape(-1) - grid.origin[1]])
+        i, j = np.linalg.solve(basis, offset)
+        positions = {grid.dimensionMap[0]: i, grid.dimensionMap[1]: j}
+        return positions[2], positions[1]
+
+    def _fence_positions(self, points, coordinates):
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        if coordinates == 'index':
+            return points[:, 0], points[:, 1]
+        if coordinates == 'annotation':
+            return ((points[:, 0] - self.iline_axis.first) / self.iline_axis.step,
+                    (points[:, 1] - self.xline_axis.first) / self.xline_axis.step)
+        if coordinates == 'world':
+            return self.world_to_index(points[:, 0], points[:, 1])
+        raise ValueError("Unknown coordinates {}, expected index, annotation or world".format(coordinates))
+
+    def read_fence(self, points, coordinates='index', interpolate=False):
+        """Reads the traces along an arbitrary path, e.g. a well path
+
+        The points are deduplicated and grouped by brick, so the cost scales
+        with the number of bricks touched rather than the number of points.
+
+        Parameters
+        ----------
+        points : array_like of float, shape (n_points, 2)
+            The (inline, crossline) positions of the traces
+        coordinates : {'index', 'annotation', 'world'}, optional
+            Whether points are ordinal indices, inline and crossline numbers,
+            or world (x, y) coordinates
+        interpolate : bool, optional
+            Interpolate bilinearly between the four surrounding traces. By
+            default the nearest trace is taken
+
+        Returns
+        -------
+        traces : numpy.ndarray of float32, shape (n_points, n_samples)
+            The traces at the points, decompressed
+        """
+        il, xl = self._fence_positions(points, coordinates)
+        if len(il) == 0:
+            return np.empty((0, self.n_samples), dtype=np.float32)
+        tolerance = 1e-6
+        outside = (il < -tolerance) | (il > self.n_ilines - 1 + tolerance) | \
+                  (xl < -tolerance) | (xl > self.n_xlines - 1 + tolerance)
+        if outside.any():
+            point = np.asarray(points, dtype=float).reshape(-1, 2)[outside][0]
+            raise IndexError("Point {} is outside the survey".format(tuple(point)))
+        il = np.clip(il, 0, self.n_ilines - 1)
+        xl = np.clip(xl, 0, self.n_xlines - 1)
+
+        if not interpolate:
+            return self._read_nodes(np.rint(il).astype(np.int64), np.rint(xl).astype(np.int64))
+
+        il0 = np.minimum(np.floor(il).astype(np.int64), max(self.n_ilines - 2, 0))
+        xl0 = np.minimum(np.floor(xl).astype(np.int64), max(self.n_xlines - 2, 0))
+        il1 = np.minimum(il0 + 1, self.n_ilines - 1)
+        xl1 = np.minimum(xl0 + 1, self.n_xlines - 1)
+        fi, fx = (il - il0)[:, np.newaxis], (xl - xl0)[:, np.newaxis]
+
+        corners = self._read_nodes(np.concatenate([il0, il0, il1, il1]),
+                                   np.concatenate([xl0, xl1, xl0, xl1]))
+        c00, c01, c10, c11 = np.split(corners, 4)
+        traces = (1 - fi) * ((1 - fx) * c00 + fx * c01) + fi * ((1 - fx) * c10 + fx * c11)
+        return traces.astype(np.float32)
+
+    def read_random_line(self, vertices, coordinates='index', interpolate=True):
+        """Reads the traces along a polyline, one trace per bin of length
+
+        Parameters
+        ----------
+        vertices : array_like of float, shape (n_vertices, 2)
+            The (inline, crossline) positions of the polyline's vertices
+        coordinates : {'index', 'annotation', 'world'}, optional
+            As for read_fence
+        interpolate : bool, optional
+            As for read_fence
+
+        Returns
+        -------
+        positions : numpy.ndarray of float, shape (n_traces, 2)
+            The (inline, crossline) index positions of the traces, spaced at
+            most one bin apart and including every vertex
+        traces : numpy.ndarray of float32, shape (n_traces, n_samples)
+            The traces along the polyline, decompressed
+        """
+        il, xl = self._fence_positions(vertices, coordinates)
+        vertices = np.stack([il, xl], axis=1)
+        positions = [vertices[:1]]
+        for start, stop in zip(vertices, vertices[1:]):
+            steps = max(int(np.ceil(np.hypot(*(stop - start)))), 1)
+            positions.append(start + (stop - start) * np.arange(1, steps + 1)[:, np.newaxis] / steps)
+        positions = np.concatenate(positions)
+        return positions, self.read_fence(positions, interpolate=interpolate)
+
+    def read_along_surface(self, surface, window=None, statistic=None):
+        """Reads amplitudes along a horizon
+
+        Only the samples the surface (and window) passes through are fetched,
+        one request per brick column, and amplitudes between samples are
+        interpolated linearly.
+
+        Parameters
+        ----------
+        surface : array_like of float, shape (n_ilines, n_xlines)
+            The time/depth of the horizon at every trace, in the units of
+            samples. NaN marks traces where the horizon is undefined
+        window : float or (float, float), optional
+            Also read the samples this far above and below the surface, in
+            the units of samples. A single number gives a symmetric window
+        statistic : {'rms', 'mean', 'maxabs', 'min', 'max'}, optional
+            Reduce the window to one value per trace
+
+        Returns
+        -------
+        amplitudes : numpy.ndarray of float32
+            Shape (n_ilines, n_xlines) without a window or with a statistic,
+            else (n_ilines, n_xlines, n_window), with the window sampled at
+            the volume's sample interval. NaN where the surface is undefined
+            or the window leaves the volume
+        """
+        surface = np.asarray(surface, dtype=float)
+        if surface.shape != (self.n_ilines, self.n_xlines):
+            raise ValueError("surface has shape {}, expected {}".format(surface.shape, (self.n_ilines, self.n_xlines)))
+        reducers = {'rms': lambda a: np.sqrt(np.mean(a ** 2, axis=-1)),
+                    'mean': lambda a: np.mean(a, axis=-1),
+                    'maxabs': lambda a: np.max(np.abs(a), axis=-1),
+                    'min': lambda a: np.min(a, axis=-1),
+                    'max': lambda a: np.max(a, axis=-1)}
+        if statistic is not None and statistic not in reducers:
+            raise ValueError("Unknown statistic {}, expected one of {}".format(statistic, sorted(reducers)))
+
+        above, below = (0, 0) if window is None else np.broadcast_to(window, (2,))
+        step = self.sample_axis.step
+        offsets = np.arange(-int(round(above / step)), int(round(below / step)) + 1)
+        positions = (surface - self.sample_axis.first) / step
+        positions = positions[..., np.newaxis] + offsets
+        valid = (positions >= 0) & (positions <= self.n_samples - 1)
+
+        amplitudes = np.full(positions.shape, np.nan, dtype=np.float32)
+        il_edges = self._brick_edges(0, self.n_ilines)
+        xl_edges = self._brick_edges(0, self.n_xlines)
+        for il0, il1 in zip(il_edges, il_edges[1:]):
+            for xl0, xl1 in zip(xl_edges, xl_edges[1:]):
+                tile = valid[il0:il1, xl0:xl1]
+                if not tile.any():
+                    continue
+                position = positions[il0:il1, xl0:xl1]
+                z0 = int(np.floor(position[tile].min()))
+                z1 = min(int(np.floor(position[tile].max())) + 2, self.n_samples)
+                block = self.read_subvolume(il0, il1, xl0, xl1, z0, z1)
+
+                position = np.where(tile, position, z0) - z0
+                lower = np.minimum(np.floor(position).astype(np.int64), z1 - z0 - 1)
+                upper = np.minimum(lower + 1, z1 - z0 - 1)
+                fraction = position - lower
+                values = ((1 - fraction) * np.take_along_axis(block, lower, axis=2)
+                          + fraction * np.take_along_axis(block, upper, axis=2))
+                amplitudes[il0:il1, xl0:xl1] = np.where(tile, values, np.nan)
+
+        if window is None:
+            return amplitudes[..., 0]
+        if statistic is None:
+            return amplitudes
+        return reducers[statistic](amplitudes).astype(np.float32)
+
+    def read_trace_headers(self, indices):
+        """Reads many raw trace headers from VDS file, grouped into few requests
+
+        Parameters
+        ----------
+        indices : array_like of int
+            The ordinal numbers of the trace headers in the file, in any order
+
+        Returns
+        -------
+        headers : numpy.ndarray of uint8, shape (len(indices), 240)
+            The specified trace headers, as the bytes stored in the SEG-Y file
+        """
+        return self._read_trace_channel(indices, 240, np.uint8, method='read_trace_headers',
+                                        channel=self.layout.getChannelIndex('SEGYTraceHeader'),
+                                        format=openvds.VolumeDataChannelDescriptor.Format.Format_U8)
+
+    def gen_trace_headers(self, indices):
+        """Reads many trace headers from VDS file, grouped into few requests
+
+        Parameters
+        ----------
+        indices : array_like of int
+            The ordinal numbers of the trace headers in the file, in any order
+
+        Returns
+        -------
+        headers : list of dict
+            The headers as dictionaries of headerword-value pairs
+        """
+        return [segyio.segy.Field(raw.tobytes(), kind='trace') for raw in self.read_trace_headers(indices)]
+
+    def read_trace_field(self, field, indices):
+        """Reads one header word for many traces from VDS file
+
+        Only the bytes of the requested word are fetched from the trace
+        header channel, in brick-sized blocks of traces.
+
+        Parameters
+        ----------
+        field : int or segyio.TraceField
+            The header word, as its byte offset in the trace header
+        indices : array_like of int
+            The ordinal numbers of the traces in the file, in any order
+
+        Returns
+        -------
+        attributes : numpy.ndarray of intc, shape (len(indices),)
+            The value of the header word for each trace
+        """
+        try:
+            size = _TRACE_FIELD_SIZES[int(field)]
+        except KeyError:
+            raise KeyError("Unknown trace header field {}".format(field))
+
+        raw = self._read_trace_channel(indices, size, np.uint8, first=int(field) - 1, method='read_trace_field',
+                                       channel=self.layout.getChannelIndex('SEGYTraceHeader'),
+                                       format=openvds.VolumeDataChannelDescriptor.Format.Format_U8)
+        return raw.view('>i{}'.format(size)).reshape(-1).astype(np.intc)
+
     def get_file_binary_header(self):
-        bin = self.layout.getMetadata("SEGY", "BinaryHeader", openvds.core.MetadataType.BLOB)
-        return segyio.segy.Field(bin, kind='binary')
+        bin = self._metadata.header_blob(self.layout, "BinaryHeader")
+        return segyio.segy.Field(bytearray(bin), kind='binary')
 
     def get_file_text_header(self):
-        txt = self.layout.getMetadata("SEGY", "TextHeader", openvds.core.MetadataType.BLOB)
+        txt = self._metadata.header_blob(self.layout, "TextHeader")
         return [bytearray(txt.decode("cp037"), encoding="ascii", errors="ignore")]
 
 #   Copyright 2021 Equinor
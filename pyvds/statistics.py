@@ -0,0 +1,195 @@
+import functools
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+Statistics = namedtuple('Statistics', ['count', 'min', 'max', 'mean', 'std', 'rms', 'percentiles'])
+Statistics.__doc__ = """Summary statistics of a volume, as returned by VdsReader.statistics
+
+percentiles maps each requested percentile to its approximate value, see
+QuantileSketch for the accuracy. The other fields are exact for the samples
+that were read.
+"""
+
+
+class QuantileSketch:
+    """Mergeable sketch of a distribution, for approximate quantiles
+
+    Values are counted in logarithmically sized buckets, so any quantile is
+    estimated within relative_accuracy of the true value, without knowing
+    the range of the data up front. Sketches of different parts of a volume
+    merge into the sketch of the whole, exactly.
+
+    Parameters
+    ----------
+    relative_accuracy : float, optional
+        The relative error bound of the estimated quantiles
+    """
+    def __init__(self, relative_accuracy=0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1, was {}".format(relative_accuracy))
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.count = 0
+        self.zeros = 0
+        self.positive = {}
+        self.negative = {}
+
+    def _add_magnitudes(self, store, magnitudes):
+        if len(magnitudes) == 0:
+            return
+        keys = np.ceil(np.log(magnitudes.astype(np.float64)) / np.log(self.gamma)).astype(np.int64)
+        first = keys.min()
+        counts = np.bincount(keys - first)
+        for key in np.flatnonzero(counts):
+            store[int(key + first)] = store.get(int(key + first), 0) + int(counts[key])
+
+    def add(self, values):
+        """Adds an array of values to the sketch"""
+        values = np.asarray(values).reshape(-1)
+        self.count += len(values)
+        self.zeros += int(np.count_nonzero(values == 0))
+        self._add_magnitudes(self.positive, values[values > 0])
+        self._add_magnitudes(self.negative, -values[values < 0])
+
+    def merge(self, other):
+        """Adds the values counted by another sketch of the same accuracy to this one"""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches of different accuracy")
+        self.count += other.count
+        self.zeros += other.zeros
+        for store, others in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in others.items():
+                store[key] = store.get(key, 0) + count
+        return self
+
+    def _value(self, key):
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def quantile(self, q):
+        """Returns the approximate q-quantile, for q between 0 and 1"""
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1, was {}".format(q))
+        if self.count == 0:
+            return np.nan
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zeros
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.positive))
+
+
+class Summary:
+    """Mergeable moments, extremes and quantile sketch of a set of samples"""
+    def __init__(self, relative_accuracy=0.01):
+        self.count = 0
+        self.sum = 0.0
+        self.sum_squares = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def add(self, data):
+        data = data.reshape(-1)
+        if len(data) == 0:
+            return self
+        self.count += len(data)
+        self.sum += float(np.sum(data, dtype=np.float64))
+        self.sum_squares += float(np.dot(data.astype(np.float64), data))
+        self.min = min(self.min, float(data.min()))
+        self.max = max(self.max, float(data.max()))
+        self.sketch.add(data)
+        return self
+
+    def merge(self, other):
+        self.count += other.count
+        self.sum += other.sum
+        self.sum_squares += other.sum_squares
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def result(self, percentiles):
+        if self.count == 0:
+            return Statistics(0, np.nan, np.nan, np.nan, np.nan, np.nan, {p: np.nan for p in percentiles})
+        mean = self.sum / self.count
+        variance = max(0.0, self.sum_squares / self.count - mean * mean)
+        return Statistics(count=self.count,
+                          min=self.min,
+                          max=self.max,
+                          mean=mean,
+                          std=np.sqrt(variance),
+                          rms=np.sqrt(self.sum_squares / self.count),
+                          percentiles={p: self.sketch.quantile(p / 100) for p in percentiles})
+
+
+def value_range(data):
+    """Returns the (min, max) of data, to merge with merge_ranges"""
+    return float(data.min()), float(data.max())
+
+
+def merge_ranges(a, b):
+    return min(a[0], b[0]), max(a[1], b[1])
+
+
+def brick_chunks(reader, sample=None, seed=0, lod=0):
+    """Returns the (lo, hi) index bounds of the bricks of the volume
+
+    Parameters
+    ----------
+    sample : float, optional
+        Only return this fraction of the bricks, picked at random, but at
+        least one
+    seed : int, optional
+        Seed of the random pick, so estimates are repeatable
+    lod : int, optional
+        The level of detail the chunks are read at. A decimated brick covers
+        brick_size << lod full-resolution voxels, so chunks are that large
+    """
+    size = reader.brick_size << lod
+    edges = [list(range(0, n, size)) + [n] for n in (reader.n_ilines, reader.n_xlines, reader.n_samples)]
+    ranges = [list(zip(axis, axis[1:])) for axis in edges]
+    chunks = [tuple(zip(*bounds)) for bounds in
+              ((il, xl, z) for il in ranges[0] for xl in ranges[1] for z in ranges[2])]
+    if sample is not None:
+        if not 0 < sample <= 1:
+            raise ValueError("sample must be a fraction between 0 and 1, was {}".format(sample))
+        n = max(1, int(round(sample * len(chunks))))
+        picked = np.random.default_rng(seed).choice(len(chunks), size=n, replace=False)
+        chunks = [chunks[i] for i in sorted(picked)]
+    return chunks
+
+
+def reduce_chunks(reader, chunks, partial, merge, lod=0, max_workers=None):
+    """Computes partial(data) of every chunk on a thread pool, and merges the results"""
+    def read(chunk):
+        (min_il, min_xl, min_z), (max_il, max_xl, max_z) = chunk
+        return partial(reader.read_subvolume(min_il, max_il, min_xl, max_xl, min_z, max_z, lod=lod))
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='pyvds-stats') as pool:
+        return functools.reduce(merge, pool.map(read, chunks))
+
+#   Copyright 2021 Equinor
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
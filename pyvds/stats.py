@@ -0,0 +1,162 @@
+import logging
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# Upper bounds of the latency histogram buckets, in seconds. The last bucket
+# is unbounded
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+RequestRecord = namedtuple('RequestRecord', ['method', 'lo', 'hi', 'lod', 'nbytes', 'bricks',
+                                             'issue_seconds', 'wait_seconds'])
+RequestRecord.__doc__ = """One finished requestVolumeSubset call, as passed to RequestStats callbacks
+
+method is the reader method that made the request, lo and hi the requested
+(inline, crossline, sample) index range and nbytes the size of the returned
+data. issue_seconds is the time spent inside requestVolumeSubset, and
+wait_seconds the time from then until the data was available, which covers
+fetching and decompressing the bricks.
+"""
+
+
+class _MethodStats:
+    def __init__(self):
+        self.requests = 0
+        self.nbytes = 0
+        self.bricks = 0
+        self.seconds = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add(self, record):
+        seconds = record.issue_seconds + record.wait_seconds
+        self.requests += 1
+        self.nbytes += record.nbytes
+        self.bricks += record.bricks
+        self.seconds += seconds
+        self.histogram[int(np.searchsorted(LATENCY_BUCKETS, seconds))] += 1
+
+    def as_dict(self):
+        return {'requests': self.requests,
+                'nbytes': self.nbytes,
+                'bricks': self.bricks,
+                'seconds': self.seconds,
+                'histogram': list(self.histogram)}
+
+
+class RequestStats:
+    """Counts, sizes and latencies of the OpenVDS requests made by readers
+
+    Enable with VdsReader.enable_stats(). One RequestStats may be shared by
+    several readers to aggregate them.
+
+    Callbacks are called with a RequestRecord for every finished request,
+    on the thread that waited for it, e.g. to log slow reads or feed a
+    metrics exporter. They should be quick and must not raise.
+    """
+    buckets = LATENCY_BUCKETS
+
+    def __init__(self):
+        self._methods = {}
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback):
+        """Calls callback(record) for every finished request"""
+        with self._lock:
+            self._callbacks = self._callbacks + [callback]
+
+    def remove_callback(self, callback):
+        with self._lock:
+            self._callbacks = [cb for cb in self._callbacks if cb is not callback]
+
+    def record(self, record):
+        with self._lock:
+            stats = self._methods.get(record.method)
+            if stats is None:
+                stats = self._methods[record.method] = _MethodStats()
+            stats.add(record)
+            callbacks = self._callbacks
+        for callback in callbacks:
+            callback(record)
+
+    def reset(self):
+        """Zeroes all counters. Callbacks are kept"""
+        with self._lock:
+            self._methods = {}
+
+    def snapshot(self):
+        """Returns the counters per reader method
+
+        Returns
+        -------
+        stats : dict
+            Maps method names to dicts of requests, nbytes, bricks (touched),
+            seconds (total latency) and histogram, the request count per
+            latency bucket, see RequestStats.buckets
+        """
+        with self._lock:
+            return {method: stats.as_dict() for method, stats in self._methods.items()}
+
+
+def log_requests(logger=None, level=logging.DEBUG, min_seconds=0.0):
+    """Returns a RequestStats callback that logs requests
+
+    Parameters
+    ----------
+    logger : logging.Logger, optional
+        Defaults to the pyvds logger
+    level : int, optional
+        The level to log at
+    min_seconds : float, optional
+        Only log requests slower than this
+    """
+    logger = logger or logging.getLogger('pyvds')
+
+    def callback(record):
+        seconds = record.issue_seconds + record.wait_seconds
+        if seconds >= min_seconds:
+            logger.log(level, "%s %s:%s lod %d: %d bytes, %d bricks in %.3f ms",
+                       record.method, record.lo, record.hi, record.lod,
+                       record.nbytes, record.bricks, 1e3 * seconds)
+    return callback
+
+
+class TimedRequest:
+    """Wraps an OpenVDS request, recording it once its data is first accessed"""
+    def __init__(self, request, stats, method, lo, hi, lod, bricks, issued, issue_seconds):
+        self._request = request
+        self._stats = stats
+        self._record = (method, tuple(int(x) for x in lo), tuple(int(x) for x in hi), lod, bricks)
+        self._issued = issued
+        self._issue_seconds = issue_seconds
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            data = self._request.data
+            wait_seconds = time.perf_counter() - self._issued
+            method, lo, hi, lod, bricks = self._record
+            self._stats.record(RequestRecord(method, lo, hi, lod, data.nbytes, bricks,
+                                             self._issue_seconds, wait_seconds))
+            self._data = data
+        return self._data
+
+    def __getattr__(self, name):
+        return getattr(self._request, name)
+
+#   Copyright 2021 Equinor
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
@@ -0,0 +1,81 @@
+import threading
+
+AXES = {'iline': 0, 'xline': 1, 'zslice': 2}
+
+
+class Sweep:
+    """Keeps the brick slab of the current line resident during a sweep
+
+    Reading one line along an axis decompresses every brick it crosses, but
+    only uses a thin layer of each. During a sweep, the first line read from
+    a slab of bricks reads the whole slab, all brick_size lines of it, and
+    the following lines of the same slab are copied out of it. The slab is
+    dropped as soon as a line outside it is read, so sweeping the whole
+    volume decompresses each brick once.
+
+    Created by VdsReader.sweep(), see there.
+    """
+    def __init__(self, reader, axis):
+        if axis not in AXES:
+            raise ValueError("Unknown sweep axis {!r}, expected one of {}".format(axis, ', '.join(AXES)))
+        self.reader = reader
+        self.axis = AXES[axis]
+        self.slabs_read = 0
+        self._stack = None
+        self._slab = None
+        self._start = self._stop = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self._stack = self.reader._sweep_stack()
+        self._stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # Remove only this sweep, also when sweeps are exited out of order
+        self._stack.remove(self)
+        self._slab = None
+
+    @property
+    def nbytes(self):
+        """The size of the slab currently held, in bytes"""
+        slab = self._slab
+        return 0 if slab is None else slab.nbytes
+
+    def _load(self, index):
+        reader = self.reader
+        n = (reader.n_ilines, reader.n_xlines, reader.n_samples)[self.axis]
+        if not 0 <= index < n:
+            raise IndexError("Index {} is out of range, the axis has {} lines".format(index, n))
+        start = index - index % reader.brick_size
+        stop = min(start + reader.brick_size, n)
+        bounds = [0, reader.n_ilines, 0, reader.n_xlines, 0, reader.n_samples]
+        bounds[2 * self.axis:2 * self.axis + 2] = start, stop
+        # Drop the old slab before reading the next, so only one is held at a time
+        self._slab = None
+        self._slab = reader.read_subvolume(*bounds)
+        self._start, self._stop = start, stop
+        self.slabs_read += 1
+
+    def read_line(self, index, deliver):
+        """Returns deliver(line), where line is a view of the line at index in the slab"""
+        with self._lock:
+            if self._slab is None or not self._start <= index < self._stop:
+                self._load(index)
+            key = [slice(None)] * 3
+            key[self.axis] = index - self._start
+            return deliver(self._slab[tuple(key)])
+
+#   Copyright 2021 Equinor
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
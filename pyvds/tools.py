@@ -1,8 +1,32 @@
 from pyvds.read import VdsReader
 
-def cube(filename):
+def cube(filename, out=None):
+    """Reads the whole volume from VDS file
+
+    Parameters
+    ----------
+    filename : str
+        The path or url of the VDS file
+    out : numpy.ndarray, optional
+        Array of shape (n_ilines, n_xlines, n_samples) to write the volume
+        into, e.g. a numpy.memmap. The volume is then streamed through it
+        brick by brick, and never held in memory as a whole
+
+    Returns
+    -------
+    volume : numpy.ndarray, shape (n_ilines, n_xline, n_samples)
+        The whole volume, decompressed
+    """
     with VdsReader(filename) as reader:
-        return reader.read_volume()
+        if out is None:
+            return reader.read_volume()
+
+        shape = (reader.n_ilines, reader.n_xlines, reader.n_samples)
+        if out.shape != shape:
+            raise ValueError("out has shape {}, the volume has shape {}".format(out.shape, shape))
+        for chunk in reader.iter_chunks():
+            out[chunk.index] = chunk.data
+        return out
 
 def dt(reader):
     return 1000 * (reader.samples[1] - reader.samples[0])
@@ -8,6 +8,7 @@ setuptools.setup(name='pyvds',
 
                  use_scm_version=True,
                  install_requires=['openvds', 'numpy', 'segyio'],
+                 extras_require={'dask': ['dask[array]'], 'xarray': ['dask[array]', 'xarray']},
                  setup_requires=['setuptools', 'setuptools_scm'],
                  packages=['pyvds']
                  )
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+import segyio
+import pyvds
+from pyvds.read import VdsReader
+
+VDS_FILE = 'test_data/small.vds'
+SGY_FILE = 'test_data/small.sgy'
+
+
+def test_array_indexing():
+    vol_segy = segyio.tools.cube(SGY_FILE)
+    with pyvds.VdsArray(VDS_FILE) as array:
+        assert array.shape == vol_segy.shape
+        assert len(array) == 5
+        assert array.nbytes == vol_segy.size * 4
+        for key in [(2,), (-1, 3), (1, slice(None), 7), (Ellipsis, 10),
+                    (slice(1, 4), slice(0, 5, 2), slice(3, 40, 9)),
+                    (slice(None, None, -2), Ellipsis, slice(49, 0, -7)),
+                    (slice(4, 2),)]:
+            assert np.allclose(array[key], vol_segy[key], rtol=1e-5)
+            assert array[key].shape == vol_segy[key].shape
+        assert np.allclose(np.asarray(array), vol_segy, rtol=1e-5)
+
+        with pytest.raises(IndexError):
+            array[5]
+        with pytest.raises(IndexError):
+            array[0, 0, 0, 0]
+        with pytest.raises(IndexError):
+            array[[0, 1]]
+
+def test_array_skips_bricks():
+    vol_segy = segyio.tools.cube(SGY_FILE)
+    with VdsReader(VDS_FILE) as reader:
+        reader.brick_size = 2
+        array = pyvds.VdsArray(reader)
+        requests = []
+        read_subvolume = reader.read_subvolume
+        reader.read_subvolume = lambda *bounds: requests.append(bounds) or read_subvolume(*bounds)
+        assert np.allclose(array[::3, 1, 10:20], vol_segy[::3, 1, 10:20], rtol=1e-5)
+        assert requests == [(0, 1, 1, 2, 10, 20), (3, 4, 1, 2, 10, 20)]
+        assert array.chunks == ((2, 2, 1), (2, 2, 1), (2,) * 25)
+
+        # One brick slab of inlines at a time, never the whole bounding box
+        requests.clear()
+        assert np.allclose(array[1:5, ::-1, 3:40], vol_segy[1:5, ::-1, 3:40], rtol=1e-5)
+        assert requests == [(1, 2, 0, 5, 3, 40), (2, 4, 0, 5, 3, 40), (4, 5, 0, 5, 3, 40)]
+
+def test_to_dask():
+    pytest.importorskip('dask.array')
+    vol_segy = segyio.tools.cube(SGY_FILE)
+    with pyvds.VdsArray(VDS_FILE) as array:
+        volume = array.to_dask()
+        assert volume.chunks == array.chunks
+        assert np.allclose(volume.mean(axis=2).compute(), vol_segy.mean(axis=2), rtol=1e-5)
+
+def test_to_xarray():
+    pytest.importorskip('xarray')
+    pytest.importorskip('dask.array')
+    vol_segy = segyio.tools.cube(SGY_FILE)
+    with pyvds.VdsArray(VDS_FILE) as array:
+        volume = array.to_xarray()
+        assert volume.dims == ('iline', 'xline', 'sample')
+        assert np.allclose(volume.sel(iline=3, xline=22).values, vol_segy[2, 2], rtol=1e-5)
+        assert np.allclose(volume.sel(sample=40.0).values, vol_segy[:, :, 10], rtol=1e-5)
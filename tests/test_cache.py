@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+import pyvds
+from pyvds.cache import LineCache
+from pyvds.read import VdsReader
+
+VDS_FILE = 'test_data/small.vds'
+
+
+def test_lru_eviction():
+    cache = LineCache(max_bytes=3 * 40)
+    for key in range(3):
+        cache.put(key, np.zeros(10, dtype=np.float32))
+    assert cache.get(0) is not None
+    cache.put(3, np.zeros(10, dtype=np.float32))
+    assert 1 not in cache
+    assert 0 in cache and 2 in cache and 3 in cache
+    assert cache.get(1) is None
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 1,
+                             'lines': 3, 'nbytes': 120, 'max_bytes': 120}
+
+
+def test_oversized_lines_are_not_cached():
+    cache = LineCache(max_bytes=16)
+    cache.put('line', np.zeros(10, dtype=np.float32))
+    assert len(cache) == 0
+
+
+def test_cached_reads():
+    uncached = VdsReader(VDS_FILE)
+    with VdsReader(VDS_FILE, cache_size=1 << 20) as reader:
+        for read in ['read_inline', 'read_crossline', 'read_zslice']:
+            first = getattr(reader, read)(2)
+            second = getattr(reader, read)(2)
+            assert second is first
+            assert not second.flags.writeable
+            assert np.array_equal(second, getattr(uncached, read)(2))
+        assert reader.cache.hits == 3
+        assert reader.cache.misses == 3
+        assert np.array_equal(reader.get_trace(2 * reader.n_xlines + 4), uncached.get_trace(2 * reader.n_xlines + 4))
+        assert reader.cache.hits == 4
+
+
+def test_batched_reads_fill_cache():
+    with pyvds.open(VDS_FILE, cache_size=1 << 20) as vdsfile:
+        lines = vdsfile.iline[1:6]
+        for index in range(5):
+            assert (0, index) in vdsfile.cache
+        assert np.array_equal(vdsfile.iline[1:6], lines)
+        assert np.array_equal(vdsfile.iline[3], lines[2])
+        with pytest.raises(ValueError):
+            vdsfile.iline[3][0, 0] = 0
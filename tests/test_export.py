@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+import segyio
+import pyvds
+from pyvds.export import ieee_to_ibm
+
+VDS_FILE = 'test_data/small.vds'
+SGY_FILE = 'test_data/small.sgy'
+
+
+@pytest.mark.parametrize('chunk_inlines, threads', [(None, 2), (2, 0), (1, 3)])
+def test_round_trip(tmp_path, chunk_inlines, threads):
+    out = str(tmp_path / 'out.sgy')
+    pyvds.to_segy(VDS_FILE, out, chunk_inlines=chunk_inlines, threads=threads)
+    with open(SGY_FILE, 'rb') as original, open(out, 'rb') as exported:
+        original, exported = original.read(), exported.read()
+    assert len(exported) == len(original)
+    assert exported[:3600] == original[:3600]
+
+    with segyio.open(out) as exported, segyio.open(SGY_FILE) as original:
+        assert int(exported.format) == int(original.format) == 1
+        assert np.allclose(segyio.tools.cube(exported), segyio.tools.cube(original), rtol=1e-5)
+        for index in range(original.tracecount):
+            assert exported.header[index] == original.header[index]
+
+def test_unsupported_format(tmp_path, monkeypatch):
+    # 4-byte fixed point with gain, obsolete and not exportable
+    monkeypatch.setattr(pyvds.export._SegyEncoder, '_format', lambda self, layout: 4)
+    with pytest.raises(ValueError):
+        pyvds.to_segy(VDS_FILE, str(tmp_path / 'out.sgy'))
+
+def test_ieee_to_ibm():
+    values = np.array([0.0, 1.0, -1.0, 0.1, 118.625], dtype=np.float32)
+    expected = [0x00000000, 0x41100000, 0xc1100000, 0x40199999, 0x4276a000]
+    assert ieee_to_ibm(values).tolist() == expected
+    assert ieee_to_ibm(np.array([np.inf, -np.inf], dtype=np.float32)).tolist() == [0x7fffffff, 0xffffffff]
+    with segyio.open(SGY_FILE) as f:
+        samples = f.trace.raw[:]
+    ibm = ieee_to_ibm(samples)
+    restored = np.frombuffer(ibm.astype('>u4').tobytes(), dtype=np.uint8)
+    with open(SGY_FILE, 'rb') as f:
+        raw = np.frombuffer(f.read(), dtype=np.uint8)[3600:].reshape(25, -1)[:, 240:]
+    assert np.array_equal(restored, raw.reshape(-1))
@@ -0,0 +1,62 @@
+import os
+import shutil
+import numpy as np
+import pytest
+import segyio
+import pyvds
+from pyvds.metadata import MetadataCache
+from pyvds.read import VdsReader
+
+VDS_FILE = 'test_data/small.vds'
+SGY_FILE = 'test_data/small.sgy'
+
+
+@pytest.fixture
+def metadata_cache():
+    cache = pyvds.enable_metadata_cache(max_files=2)
+    yield cache
+    pyvds.disable_metadata_cache()
+
+def test_lazy_headers():
+    with pyvds.open(VDS_FILE) as vdsfile:
+        assert vdsfile._text is None and vdsfile._bin is None
+        with segyio.open(SGY_FILE) as segyfile:
+            assert vdsfile.bin == segyfile.bin
+            assert vdsfile.text[0].startswith(b'C 1')
+        assert vdsfile.bin is vdsfile.bin
+        with pytest.raises(ValueError):
+            vdsfile.ilines[0] = 0
+
+def test_lazy_axes():
+    with pyvds.open(VDS_FILE) as vdsfile:
+        assert vdsfile._metadata._values == {}
+        with segyio.open(SGY_FILE) as segyfile:
+            assert np.array_equal(vdsfile.iline.keys(), segyfile.iline.keys())
+            assert 22 in vdsfile.xline
+            assert set(vdsfile._metadata._values) == {'ilines', 'xlines', 'xline_axis'}
+            assert np.array_equal(vdsfile.depth_slice.keys(), segyfile.samples)
+
+def test_reopen_hits_cache(metadata_cache):
+    with pyvds.open(VDS_FILE) as first:
+        ilines, samples, bin = first.ilines, first.samples, first.bin
+    with pyvds.open(VDS_FILE) as second:
+        assert second._metadata is first._metadata
+        assert second.ilines is ilines and second.samples is samples
+        assert second.bin == bin
+        assert second.bin is not bin
+    assert metadata_cache.stats() == {'hits': 1, 'misses': 1, 'files': 1, 'max_files': 2}
+
+def test_changed_file_misses_cache(metadata_cache, tmp_path):
+    copy = str(tmp_path / 'small.vds')
+    shutil.copy(VDS_FILE, copy)
+    with VdsReader(copy) as reader:
+        first = reader._metadata
+    os.utime(copy, ns=(0, 0))
+    with VdsReader(copy) as reader:
+        assert reader._metadata is not first
+        assert np.array_equal(reader.xlines, first.xlines)
+    assert metadata_cache.stats()['misses'] == 2
+
+def test_only_local_files_are_cached():
+    assert MetadataCache.key('s3://bucket/volume.vds') is None
+    assert MetadataCache.key(VDS_FILE)[0] == os.path.abspath(VDS_FILE)
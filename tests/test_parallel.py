@@ -0,0 +1,42 @@
+import pickle
+
+import numpy as np
+import segyio
+from pyvds.parallel import ReaderSpec, map_chunks, partition
+from pyvds.read import VdsReader
+
+VDS_FILE = 'test_data/small.vds'
+SGY_FILE = 'test_data/small.sgy'
+
+
+def rms(chunk):
+    return np.sqrt(np.mean(chunk.data ** 2, axis=2))
+
+
+def test_reader_spec_pickles():
+    spec = ReaderSpec(VDS_FILE, cache_size=1 << 20)
+    assert spec.reader.n_ilines == 5
+    copy = pickle.loads(pickle.dumps(spec))
+    assert copy._reader is None
+    assert copy.reader.cache.max_bytes == 1 << 20
+    assert np.array_equal(copy.reader.read_inline(1), spec.reader.read_inline(1))
+    spec.close()
+    copy.close()
+
+
+def test_partition():
+    with VdsReader(VDS_FILE) as reader:
+        assert partition(reader) == [(0, 5)]
+        reader.brick_size = 2
+        assert partition(reader) == [(0, 2), (2, 4), (4, 5)]
+        assert partition(reader, 2) == [(0, 4), (4, 5)]
+        assert partition(reader, 10) == [(0, 2), (2, 4), (4, 5)]
+
+
+def test_map_chunks(tmp_path):
+    expected = np.sqrt(np.mean(segyio.tools.cube(SGY_FILE) ** 2, axis=2))
+    assert np.allclose(map_chunks(rms, VDS_FILE, processes=2), expected, rtol=1e-5)
+
+    out = np.memmap(str(tmp_path / 'rms.dat'), dtype=np.float32, mode='w+', shape=expected.shape)
+    assert map_chunks(rms, ReaderSpec(VDS_FILE), processes=2, out=out) is out
+    assert np.allclose(out, expected, rtol=1e-5)
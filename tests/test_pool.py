@@ -0,0 +1,110 @@
+import shutil
+import threading
+import time
+import numpy as np
+import pytest
+import segyio
+import pyvds
+
+VDS_FILE = 'test_data/small.vds'
+SGY_FILE = 'test_data/small.sgy'
+
+
+@pytest.fixture
+def copies(tmp_path):
+    paths = [str(tmp_path / 'small{}.vds'.format(i)) for i in range(3)]
+    for path in paths:
+        shutil.copy(VDS_FILE, path)
+    return paths
+
+def test_pool_shares_readers():
+    with pyvds.ReaderPool() as pool:
+        with pool.open(VDS_FILE) as first:
+            with pool.open(VDS_FILE) as second:
+                assert first is second
+            with segyio.open(SGY_FILE) as segyfile:
+                assert np.allclose(first.iline[3], segyfile.iline[3], rtol=1e-5)
+        with pool.open(VDS_FILE) as third:
+            assert third is first
+        assert pool.stats() == {'hits': 2, 'misses': 1, 'evictions': 0, 'open': 1, 'leased': 0}
+    assert first.filehandle is None
+
+def test_pool_evicts_least_recently_used(copies):
+    with pyvds.ReaderPool(max_open=2) as pool:
+        readers = []
+        for path in copies[:2]:
+            with pool.open(path) as reader:
+                readers.append(reader)
+        with pool.open(copies[0]):
+            pass
+        with pool.open(copies[2]):
+            pass
+        assert copies[0] in pool and copies[1] not in pool
+        assert readers[1].filehandle is None
+        assert readers[0].filehandle is not None
+        assert pool.stats()['evictions'] == 1
+
+def test_pool_waits_for_release(copies):
+    with pyvds.ReaderPool(max_open=1) as pool:
+        lease = pool.open(copies[0])
+        with pytest.raises(TimeoutError):
+            pool.open(copies[1], timeout=0.01)
+
+        threading.Timer(0.05, lease.release).start()
+        with pool.open(copies[1], timeout=5) as reader:
+            assert reader.n_ilines == 5
+        assert lease.reader.filehandle is None
+
+def test_pool_waiters_share_reader(copies):
+    with pyvds.ReaderPool(max_open=2) as pool:
+        leases = [pool.open(path) for path in copies[:2]]
+        opened = []
+        threads = [threading.Thread(target=lambda: opened.append(pool.open(copies[2], timeout=5)))
+                   for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        leases[0].release()
+        for thread in threads:
+            thread.join()
+
+        assert len(opened) == 2
+        assert opened[0].reader is opened[1].reader
+        assert pool.stats() == {'hits': 1, 'misses': 3, 'evictions': 1, 'open': 2, 'leased': 2}
+        opened[0].release()
+        leases[1].release()
+        # Room for copies[0] is made by evicting copies[1], not the reader still leased
+        with pool.open(copies[0]):
+            assert copies[2] in pool and copies[1] not in pool
+        assert opened[1].reader.filehandle is not None
+        opened[1].release()
+
+def test_pool_idle_timeout(copies):
+    with pyvds.ReaderPool(idle_timeout=0.01) as pool:
+        with pool.open(copies[0]) as reader:
+            time.sleep(0.02)
+            pool.prune()
+            assert copies[0] in pool
+        time.sleep(0.02)
+        pool.prune()
+        assert copies[0] not in pool
+        assert reader.filehandle is None
+
+def test_closed_pool(copies):
+    pool = pyvds.ReaderPool()
+    lease = pool.open(copies[0])
+    pool.close()
+    assert lease.reader.filehandle is not None
+    # Not even a reader that is still leased can be leased again
+    with pytest.raises(ValueError):
+        pool.open(copies[0])
+    lease.release()
+    assert lease.reader.filehandle is None
+    with pytest.raises(ValueError):
+        pool.open(copies[0])
+
+def test_pool_open_error():
+    with pyvds.ReaderPool() as pool:
+        with pytest.raises(Exception):
+            pool.open('test_data/missing.vds')
+        assert len(pool) == 0
@@ -1,6 +1,13 @@
+import asyncio
+import shutil
+import subprocess
+import types
 import numpy as np
+import pytest
 import segyio
+import pyvds
 from pyvds.accessors import VdsReader
+from pyvds.convert import Conversion
 
 VDS_FILE = 'test_data/small.vds'
 SGY_FILE = 'test_data/small.sgy'
@@ -129,3 +136,500 @@ def compare_volume(vds_filename, tolerance):
 
 def test_read_volume():
     compare_volume(VDS_FILE, tolerance=1e-5)
+
+
+def test_read_multiple_lines():
+    reader = VdsReader(VDS_FILE)
+    vol_segy = segyio.tools.cube(SGY_FILE)
+    assert reader.read_inlines(0, 5).shape == (5, 5, 50)
+    assert np.allclose(reader.read_inlines(1, 5, 2), vol_segy[1:5:2], rtol=1e-5)
+    assert np.allclose(reader.read_crosslines(4, -1, -1), vol_segy[:, ::-1].transpose(1, 0, 2), rtol=1e-5)
+    assert np.allclose(reader.read_zslices(3, 40, 5), vol_segy[:, :, 3:40:5].transpose(2, 0, 1), rtol=1e-5)
+    assert reader.read_zslices(3, 3).shape == (0, 5, 5)
+
+
+def test_read_multiple_lines_by_slab():
+    reader = VdsReader(VDS_FILE)
+    reader.brick_size = 2
+    vol_segy = segyio.tools.cube(SGY_FILE)
+    for lines, expected in [(reader.read_inlines(0, 5, 2), vol_segy[0:5:2]),
+                            (reader.read_crosslines(1, 5), vol_segy[:, 1:5].transpose(1, 0, 2)),
+                            (reader.read_crosslines(4, -1, -3), vol_segy[:, 4::-3].transpose(1, 0, 2)),
+                            (reader.read_zslices(3, 40, 3), vol_segy[:, :, 3:40:3].transpose(2, 0, 1))]:
+        assert np.allclose(lines, expected, rtol=1e-5)
+        # A result of its own, not a strided view of everything read
+        assert lines.flags.c_contiguous and lines.flags.owndata
+
+
+def test_read_async():
+    with VdsReader(VDS_FILE) as reader:
+        futures = [reader.read_inline_async(i) for i in range(5)]
+        futures += [reader.read_crossline_async(i) for i in range(5)]
+        futures += [reader.read_zslice_async(i) for i in range(5)]
+        futures.append(reader.read_subvolume_async(1, 3, 0, 4, 10, 20))
+        expected = [reader.read_inline(i) for i in range(5)]
+        expected += [reader.read_crossline(i) for i in range(5)]
+        expected += [reader.read_zslice(i) for i in range(5)]
+        expected.append(reader.read_subvolume(1, 3, 0, 4, 10, 20))
+        for result, line in zip(pyvds.gather(futures), expected):
+            assert np.array_equal(result, line)
+
+
+def test_read_asyncio():
+    async def read_lines(reader):
+        first = await reader.read_inline_async(2)
+        rest = await pyvds.futures.gather_async([reader.read_crossline_async(i) for i in range(3)])
+        return first, rest
+
+    with VdsReader(VDS_FILE) as reader:
+        first, rest = asyncio.run(read_lines(reader))
+        assert np.array_equal(first, reader.read_inline(2))
+        assert len(rest) == 3
+        assert np.array_equal(rest[1], reader.read_crossline(1))
+
+
+def test_iter_chunks():
+    vol_segy = segyio.tools.cube(SGY_FILE)
+    with VdsReader(VDS_FILE) as reader:
+        for chunk_shape in [None, (2, 3, 16), (5, 5, 50)]:
+            volume = np.full(vol_segy.shape, np.nan, dtype=np.float32)
+            for chunk in reader.iter_chunks(chunk_shape):
+                assert np.array_equal(chunk.ilines, reader.ilines[chunk.index[0]])
+                assert np.array_equal(chunk.samples, reader.samples[chunk.index[2]])
+                volume[chunk.index] = chunk.data
+            assert np.allclose(volume, vol_segy, rtol=1e-5)
+        assert len(list(reader.iter_chunks((2, 3, 16)))) == 3 * 2 * 4
+
+
+def test_cube_into_memmap(tmp_path):
+    vol_segy = segyio.tools.cube(SGY_FILE)
+    out = np.memmap(str(tmp_path / 'cube.dat'), dtype=np.float32, mode='w+', shape=vol_segy.shape)
+    assert pyvds.tools.cube(VDS_FILE, out=out) is out
+    assert np.allclose(out, vol_segy, rtol=1e-5)
+
+
+def test_read_into_out():
+    with VdsReader(VDS_FILE) as reader:
+        reads = [(reader.read_inline, 2, (5, 50)),
+                 (reader.read_inline_number, 3, (5, 50)),
+                 (reader.read_crossline, 1, (5, 50)),
+                 (reader.read_crossline_number, 21, (5, 50)),
+                 (reader.read_zslice, 7, (5, 5)),
+                 (reader.read_zslice_coord, 28.0, (5, 5)),
+                 (reader.get_trace, 12, (50,))]
+        for read, key, shape in reads:
+            out = np.zeros(shape, dtype=np.float32)
+            assert read(key, out=out) is out
+            assert np.array_equal(out, read(key))
+
+            # Not contiguous, so filled by copy
+            strided = np.zeros(shape[:-1] + (2 * shape[-1],), dtype=np.float32)[..., ::2]
+            assert read(key, out=strided) is strided
+            assert np.array_equal(strided, read(key))
+
+        out = np.zeros((2, 3, 10), dtype=np.float32)
+        assert reader.read_subvolume(1, 3, 0, 3, 10, 20, out=out) is out
+        assert np.array_equal(out, reader.read_subvolume(1, 3, 0, 3, 10, 20))
+
+        for start, stop, step in [(0, 5, 2), (4, 0, -4)]:
+            out = np.zeros((len(range(start, stop, step)), 5, 50), dtype=np.float32)
+            assert reader.read_inlines(start, stop, step, out=out) is out
+            assert np.array_equal(out, reader.read_inlines(start, stop, step))
+
+        with pytest.raises(ValueError):
+            reader.read_inline(0, out=np.zeros((50, 5), dtype=np.float32))
+
+
+def test_read_volume_into_memmap(tmp_path):
+    with VdsReader(VDS_FILE) as reader:
+        out = np.memmap(str(tmp_path / 'volume.dat'), dtype=np.float32, mode='w+', shape=(5, 5, 50))
+        assert reader.read_volume(out=out) is out
+        assert np.allclose(out, segyio.tools.cube(SGY_FILE), rtol=1e-5)
+
+
+def test_coordinate_lookup():
+    reader = VdsReader(VDS_FILE)
+    assert reader.iline_axis.index(3) == 2
+    assert reader.xline_axis.index(24) == 4
+    assert reader.sample_axis.index(28.0) == 7
+    assert reader.sample_axis.index(28.0000001) == 7
+    assert reader.sample_axis.index(200, include_stop=True) == 50
+    for axis, coord in [(reader.iline_axis, 0), (reader.iline_axis, 6),
+                        (reader.xline_axis, 21.5), (reader.sample_axis, 30.0)]:
+        with pytest.raises(IndexError):
+            axis.index(coord)
+        assert coord not in axis
+
+    assert np.array_equal(reader.sample_axis.indices([0.0, 196.0, 8.0]), [0, 49, 2])
+    assert np.array_equal(reader.iline_axis.indices(reader.ilines), np.arange(5))
+    with pytest.raises(IndexError):
+        reader.xline_axis.indices([20, 25])
+
+    assert VdsReader.coord_to_index(23, reader.xlines) == 3
+    assert VdsReader.coord_to_index(200, reader.samples, include_stop=True) == 50
+    with pytest.raises(IndexError):
+        VdsReader.coord_to_index(19, reader.xlines)
+
+
+def test_read_subvolume_parallel():
+    with VdsReader(VDS_FILE) as reader:
+        expected = reader.read_subvolume(1, 5, 0, 4, 3, 40)
+        for brick_size in [reader.brick_size, 2]:
+            reader.brick_size = brick_size
+            for max_workers in [1, 2, 4]:
+                assert np.array_equal(reader.read_subvolume(1, 5, 0, 4, 3, 40, max_workers=max_workers), expected)
+            out = np.zeros((4, 4, 37), dtype=np.float32)
+            assert reader.read_subvolume(1, 5, 0, 4, 3, 40, out=out, max_workers=3) is out
+            assert np.array_equal(out, expected)
+        assert reader._brick_edges(1, 5) == [1, 2, 4, 5]
+
+
+def test_read_fence():
+    vol_segy = segyio.tools.cube(SGY_FILE)
+    with VdsReader(VDS_FILE) as reader:
+        points = [(0, 0), (4, 4), (2, 3), (0, 0), (3.4, 1.6)]
+        expected = vol_segy[[0, 4, 2, 0, 3], [0, 4, 3, 0, 2]]
+        assert np.allclose(reader.read_fence(points), expected, rtol=1e-5)
+
+        annotation = [(reader.ilines[il], reader.xlines[xl]) for il, xl in [(0, 0), (4, 4), (2, 3), (0, 0), (3, 2)]]
+        assert np.allclose(reader.read_fence(annotation, coordinates='annotation'), expected, rtol=1e-5)
+
+        interpolated = reader.read_fence([(1.5, 2), (4, 3.25), (0.5, 0.5)], interpolate=True)
+        assert np.allclose(interpolated[0], (vol_segy[1, 2] + vol_segy[2, 2]) / 2, rtol=1e-5)
+        assert np.allclose(interpolated[1], 0.75 * vol_segy[4, 3] + 0.25 * vol_segy[4, 4], rtol=1e-5)
+        assert np.allclose(interpolated[2], vol_segy[0:2, 0:2].mean(axis=(0, 1)), rtol=1e-5)
+
+        with pytest.raises(IndexError):
+            reader.read_fence([(0, 5)])
+
+
+@pytest.fixture(scope='module')
+def rotated_files(tmp_path_factory):
+    """A 12x9x20 survey on a grid rotated by 30 degrees, 20 m between inlines and 12.5 m between crosslines"""
+    segyimport = shutil.which('SEGYImport')
+    if segyimport is None:
+        pytest.skip("SEGYImport is needed to create a VDS file with a rotated grid")
+    directory = tmp_path_factory.mktemp('rotated')
+    sgy, vds = str(directory / 'rotated.sgy'), str(directory / 'rotated.vds')
+    angle = np.radians(30)
+    inline_step = 20 * np.array([np.cos(angle), np.sin(angle)])
+    crossline_step = 12.5 * np.array([-np.sin(angle), np.cos(angle)])
+
+    spec = segyio.spec()
+    spec.ilines = np.arange(100, 124, 2, dtype=np.intc)
+    spec.xlines = np.arange(300, 309, dtype=np.intc)
+    spec.samples = np.arange(20) * 4.0
+    spec.sorting = segyio.TraceSortingFormat.INLINE_SORTING
+    spec.format = 5
+    data = np.random.default_rng(0).standard_normal((12, 9, 20)).astype(np.float32)
+    with segyio.create(sgy, spec) as f:
+        f.bin.update(hdt=4000, hns=20, format=5)
+        for trace, (il, xl) in enumerate(np.ndindex(12, 9)):
+            x, y = (400000, 6000000) + il * inline_step + xl * crossline_step
+            f.header[trace] = {
+                segyio.TraceField.INLINE_3D: int(spec.ilines[il]),
+                segyio.TraceField.CROSSLINE_3D: int(spec.xlines[xl]),
+                segyio.TraceField.CDP_X: int(round(100 * x)),
+                segyio.TraceField.CDP_Y: int(round(100 * y)),
+                segyio.TraceField.SourceGroupScalar: -100,
+                segyio.TraceField.TRACE_SAMPLE_COUNT: 20,
+                segyio.TraceField.TRACE_SAMPLE_INTERVAL: 4000,
+            }
+            f.trace[trace] = data[il, xl]
+    subprocess.run([segyimport, '--vdsfile', vds, sgy], check=True, stdout=subprocess.DEVNULL)
+    return sgy, vds
+
+def test_read_fence_world(rotated_files):
+    sgy, vds = rotated_files
+    vol_segy = segyio.tools.cube(sgy)
+    with VdsReader(vds) as reader, segyio.open(sgy) as segyfile:
+        grid = reader.layout.getVDSIJKGridDefinitionFromMetadata()
+        assert not np.isclose(grid.iUnitStep[1], 0) and not np.isclose(np.hypot(*grid.iUnitStep[:2]), 1)
+
+        # Exactly on the grid the file defines
+        index = np.array([(0, 0), (3, 4), (11, 8), (7, 0), (2.5, 1.25)])
+        world = (np.array(grid.origin[:2]) + index[:, :1] * np.array(grid.iUnitStep[:2])
+                 + index[:, 1:] * np.array(grid.jUnitStep[:2]))
+        il, xl = reader.world_to_index(world[:, 0], world[:, 1])
+        assert np.allclose(il, index[:, 0]) and np.allclose(xl, index[:, 1])
+        assert np.allclose(reader.read_fence(world[:4], coordinates='world'),
+                           vol_segy[[0, 3, 11, 7], [0, 4, 8, 0]], rtol=1e-5)
+        assert np.allclose(reader.read_fence(world, coordinates='world', interpolate=True),
+                           reader.read_fence(index, interpolate=True), rtol=1e-5)
+
+        # The grid is fitted to the trace header coordinates, which it matches closely
+        x = segyfile.attributes(segyio.TraceField.CDP_X)[:] / 100
+        y = segyfile.attributes(segyio.TraceField.CDP_Y)[:] / 100
+        il, xl = reader.world_to_index(x, y)
+        assert np.allclose(il, np.repeat(np.arange(12), 9), atol=1e-2)
+        assert np.allclose(xl, np.tile(np.arange(9), 12), atol=1e-2)
+
+        # I and J along the sample and crossline dimensions
+        unsupported = types.SimpleNamespace(origin=grid.origin, iUnitStep=grid.iUnitStep,
+                                            jUnitStep=grid.jUnitStep, dimensionMap=(0, 1, 2))
+        reader.layout = types.SimpleNamespace(getVDSIJKGridDefinitionFromMetadata=lambda: unsupported)
+        with pytest.raises(ValueError):
+            reader.world_to_index(world[:, 0], world[:, 1])
+
+def test_read_fence_fetches_each_brick_once():
+    with VdsReader(VDS_FILE) as reader:
+        expected = reader.read_fence([(il, xl) for il in range(5) for xl in range(5)])
+        reader.brick_size = 2
+        requests = []
+        request = reader.access_manager.requestVolumeSubset
+        def counting_request(*args, **kwargs):
+            requests.append(kwargs)
+            return request(*args, **kwargs)
+        reader.access_manager.requestVolumeSubset = counting_request
+
+        traces = reader.read_fence([(il, xl) for il in range(5) for xl in range(5)] * 2)
+        assert np.array_equal(traces[:25], expected)
+        assert np.array_equal(traces[25:], expected)
+        assert len(requests) == 9
+
+
+def test_read_random_line():
+    with VdsReader(VDS_FILE) as reader:
+        positions, traces = reader.read_random_line([(0, 0), (0, 3), (4, 0)])
+        assert len(positions) == 1 + 3 + 5
+        assert np.allclose(positions[-1], (4, 0))
+        assert np.allclose(traces, reader.read_fence(positions, interpolate=True))
+        assert np.allclose(traces[3], reader.get_trace(3))
+
+
+def test_read_along_surface():
+    vol_segy = segyio.tools.cube(SGY_FILE)
+    with VdsReader(VDS_FILE) as reader:
+        surface = np.full((5, 5), 40.0)
+        surface[1, 2] = 42.0
+        surface[3, 3] = np.nan
+        surface[4, 4] = 196.0
+
+        for brick_size in [reader.brick_size, 2]:
+            reader.brick_size = brick_size
+            amplitudes = reader.read_along_surface(surface)
+            assert amplitudes.shape == (5, 5)
+            assert np.allclose(amplitudes[0, 0], vol_segy[0, 0, 10], rtol=1e-5)
+            assert np.allclose(amplitudes[1, 2], (vol_segy[1, 2, 10] + vol_segy[1, 2, 11]) / 2, rtol=1e-5)
+            assert np.isnan(amplitudes[3, 3])
+            assert np.allclose(amplitudes[4, 4], vol_segy[4, 4, 49], rtol=1e-5)
+
+            windowed = reader.read_along_surface(surface, window=8)
+            assert windowed.shape == (5, 5, 5)
+            assert np.allclose(windowed[0, 0], vol_segy[0, 0, 8:13], rtol=1e-5)
+            assert np.isnan(windowed[4, 4, -1])
+
+            rms = reader.read_along_surface(surface, window=(4, 8), statistic='rms')
+            assert np.allclose(rms[2, 1], np.sqrt(np.mean(vol_segy[2, 1, 9:13] ** 2)), rtol=1e-5)
+            maxabs = reader.read_along_surface(surface, window=(4, 8), statistic='maxabs')
+            assert np.allclose(maxabs[2, 1], np.abs(vol_segy[2, 1, 9:13]).max(), rtol=1e-5)
+
+        with pytest.raises(ValueError):
+            reader.read_along_surface(surface, window=4, statistic='median')
+
+def test_read_lod():
+    vol_segy = segyio.tools.cube(SGY_FILE)
+    with VdsReader(VDS_FILE) as reader:
+        assert reader.lod_levels == 0
+        ilines, xlines, samples = reader.lod_axes(0)
+        assert np.array_equal(ilines, reader.ilines)
+        assert np.array_equal(samples, reader.samples)
+
+        assert np.allclose(reader.read_inline(2, lod=0), vol_segy[2], rtol=1e-5)
+        assert np.allclose(reader.read_zslices(0, 50, 7, lod=0), np.moveaxis(vol_segy[:, :, 0:50:7], 2, 0), rtol=1e-5)
+        assert np.allclose(reader.read_subvolume(1, 4, 0, 5, 3, 9, lod=0), vol_segy[1:4, 0:5, 3:9], rtol=1e-5)
+
+        with pytest.raises(ValueError):
+            reader.read_inline(0, lod=1)
+        with pytest.raises(ValueError):
+            reader.lod_axes(1)
+
+@pytest.fixture(scope='module')
+def lod_files(tmp_path_factory):
+    """A 40x30x100 cube as SEG-Y, and converted to VDS with two levels of detail"""
+    segyimport = shutil.which('SEGYImport')
+    if segyimport is None:
+        pytest.skip("SEGYImport is needed to create a VDS file with levels of detail")
+    directory = tmp_path_factory.mktemp('lod')
+    sgy, vds = str(directory / 'lod.sgy'), str(directory / 'lod.vds')
+    data = np.random.default_rng(0).standard_normal((40, 30, 100)).astype(np.float32)
+    segyio.tools.from_array3D(sgy, data)
+    subprocess.run([segyimport, '--lod-levels', '2', '--vdsfile', vds, sgy], check=True, stdout=subprocess.DEVNULL)
+    return sgy, vds
+
+def test_read_lod_levels(lod_files):
+    sgy, vds = lod_files
+    vol_segy = segyio.tools.cube(sgy)
+    with VdsReader(vds) as reader:
+        assert reader.lod_levels == 2
+        # Brick edges inside the subvolume, to split it into tiles and slabs
+        reader.brick_size = 8
+        for lod in [1, 2]:
+            step = 2 ** lod
+            decimated = vol_segy[::step, ::step, ::step]
+            ilines, xlines, samples = reader.lod_axes(lod)
+            assert (len(ilines), len(xlines), len(samples)) == decimated.shape
+
+            assert np.allclose(reader.read_inline(6, lod=lod), decimated[6 >> lod], rtol=1e-5)
+            assert np.allclose(reader.read_zslice(7, lod=lod), decimated[:, :, 7 >> lod], rtol=1e-5)
+            assert np.allclose(reader.read_crossline_async(9, lod=lod).result(), decimated[:, 9 >> lod], rtol=1e-5)
+
+            # OpenVDS returns ceil((hi - lo) / 2**lod) voxels, from the one at lo >> lod
+            lo, hi = (3, 5, 7), (37, 29, 93)
+            first = [l >> lod for l in lo]
+            shape = [-(-(h - l) // step) for l, h in zip(lo, hi)]
+            expected = decimated[first[0]:first[0] + shape[0],
+                                 first[1]:first[1] + shape[1],
+                                 first[2]:first[2] + shape[2]]
+            assert expected.shape == tuple(shape)
+            for max_workers in [None, 2]:
+                subvolume = reader.read_subvolume(3, 37, 5, 29, 7, 93, lod=lod, max_workers=max_workers)
+                assert np.allclose(subvolume, expected, rtol=1e-5)
+                subvolume = reader.read_subvolume(3, 37, 5, 29, 7, 93, lod=lod, max_workers=max_workers,
+                                                  order='sxi')
+                assert np.allclose(subvolume, expected.transpose(2, 1, 0), rtol=1e-5)
+            future = reader.read_subvolume_async(3, 37, 5, 29, 7, 93, lod=lod)
+            assert np.allclose(future.result(), expected, rtol=1e-5)
+            future = reader.read_subvolume_async(3, 37, 5, 29, 7, 93, lod=lod, order='sxi', dtype=np.float64)
+            assert np.allclose(future.result(), expected.transpose(2, 1, 0), rtol=1e-5)
+
+            volume = reader.read_subvolume(0, 40, 0, 30, 0, 100, lod=lod, max_workers=3)
+            assert np.allclose(volume, decimated, rtol=1e-5)
+
+            # Batched reads give every decimated line once
+            inlines = reader.read_inlines(0, 40, lod=lod)
+            assert inlines.shape == (len(ilines), len(xlines), len(samples))
+            assert np.allclose(inlines, decimated, rtol=1e-5)
+            assert np.allclose(reader.read_inlines(5, 37, 3, lod=lod, order='sx'),
+                               decimated[sorted({i >> lod for i in range(5, 37, 3)})].transpose(0, 2, 1), rtol=1e-5)
+            assert np.allclose(reader.read_crosslines(29, 2, -1, lod=lod),
+                               decimated[:, sorted({i >> lod for i in range(3, 30)}, reverse=True)].transpose(1, 0, 2),
+                               rtol=1e-5)
+            assert np.allclose(reader.read_zslices(0, 100, lod=lod), np.moveaxis(decimated, 2, 0), rtol=1e-5)
+            assert np.allclose(reader.read_zslices(10, 90, 4, dtype=np.float64, lod=lod),
+                               np.moveaxis(decimated[:, :, (10 >> lod):(90 >> lod):4 >> lod], 2, 0), rtol=1e-5)
+
+            # Estimates read each decimated brick in one request
+            stats = reader.enable_stats()
+            estimate = reader.statistics(percentiles=(), lod=lod)
+            assert estimate.count == decimated.size
+            assert np.isclose(estimate.max, decimated.max(), rtol=1e-5)
+            bricks = np.prod([-(-n // (reader.brick_size << lod)) for n in (40, 30, 100)])
+            assert stats.snapshot()['read_subvolume']['requests'] == bricks
+            # Each touches exactly one brick of the level
+            assert stats.snapshot()['read_subvolume']['bricks'] == bricks
+            counts, edges = reader.histogram(bins=10, lod=lod)
+            assert np.array_equal(counts, np.histogram(decimated, bins=edges)[0])
+            assert np.isclose(edges[0], decimated.min(), rtol=1e-5)
+            reader.disable_stats()
+
+def test_lod_accessor_levels(lod_files):
+    sgy, vds = lod_files
+    vol_segy = segyio.tools.cube(sgy)
+    with pyvds.open(vds) as vdsfile:
+        for lod in [1, 2]:
+            step = 2 ** lod
+            decimated = vol_segy[::step, ::step, ::step]
+            ilines, xlines, samples = vdsfile.lod_axes(lod)
+            for accessor, keys, expected in [(vdsfile.iline.at_lod(lod), ilines, decimated),
+                                             (vdsfile.xline.at_lod(lod), xlines, decimated.transpose(1, 0, 2)),
+                                             (vdsfile.depth_slice.at_lod(lod), samples, np.moveaxis(decimated, 2, 0))]:
+                assert len(accessor) == len(keys) == len(expected)
+                assert np.array_equal(accessor.keys(), keys)
+                assert np.allclose(accessor[:], expected, rtol=1e-5)
+                lines = list(accessor)
+                assert len(lines) == len(expected)
+                assert np.allclose(np.stack(lines), expected, rtol=1e-5)
+            assert np.allclose(vdsfile.iline.at_lod(lod)[ilines[3]], decimated[3], rtol=1e-5)
+            assert np.allclose(vdsfile.depth_slice.at_lod(lod)[-1], decimated[:, :, -1], rtol=1e-5)
+            assert np.allclose(vdsfile.depth_slice.at_lod(lod)[2:9:3], np.moveaxis(decimated[:, :, 2:9:3], 2, 0), rtol=1e-5)
+            assert ilines[1] in vdsfile.iline.at_lod(lod) and ilines[0] + 1 not in vdsfile.iline.at_lod(lod)
+
+def test_read_order():
+    vol_segy = segyio.tools.cube(SGY_FILE)
+    with VdsReader(VDS_FILE, cache_size=2**20) as reader:
+        inline = reader.read_inline(1, order='sx')
+        assert inline.shape == (50, 5) and inline.flags.c_contiguous and inline.flags.writeable
+        assert np.allclose(inline, vol_segy[1].T, rtol=1e-5)
+        assert np.allclose(reader.read_inline(1, order='sx'), vol_segy[1].T, rtol=1e-5)
+        assert np.allclose(reader.read_crossline_number(22, order='si'), vol_segy[:, 2].T, rtol=1e-5)
+        assert np.allclose(reader.read_zslice(4, order='xi'), vol_segy[:, :, 4].T, rtol=1e-5)
+        assert np.allclose(reader.read_zslice_async(4, order='xi').result(), vol_segy[:, :, 4].T, rtol=1e-5)
+
+        out = np.empty((3, 50, 5), dtype=np.float32)
+        lines = reader.read_inlines(0, 5, 2, out=out, order='sx')
+        assert lines is out
+        assert np.allclose(out, np.transpose(vol_segy[0:5:2], (0, 2, 1)), rtol=1e-5)
+
+        for max_workers in [None, 4]:
+            subvolume = reader.read_subvolume(1, 4, 0, 5, 3, 9, order='sxi', max_workers=max_workers)
+            assert subvolume.flags.c_contiguous
+            assert np.allclose(subvolume, np.transpose(vol_segy[1:4, 0:5, 3:9], (2, 1, 0)), rtol=1e-5)
+        future = reader.read_subvolume_async(1, 4, 0, 5, 3, 9, order='xis')
+        assert np.allclose(future.result(), np.transpose(vol_segy[1:4, 0:5, 3:9], (1, 0, 2)), rtol=1e-5)
+        assert np.allclose(reader.read_volume(order='ixs'), vol_segy, rtol=1e-5)
+
+        with pytest.raises(ValueError):
+            reader.read_inline(1, order='si')
+        with pytest.raises(ValueError):
+            reader.read_inline(1, out=np.empty((5, 50), dtype=np.float32), order='sx')
+
+def test_read_dtype():
+    vol_segy = segyio.tools.cube(SGY_FILE)
+    with VdsReader(VDS_FILE) as reader:
+        inline = reader.read_inline(1, dtype=np.float16)
+        assert inline.dtype == np.float16
+        assert np.allclose(inline, vol_segy[1], rtol=1e-3)
+
+        low, high = float(vol_segy.min()), float(vol_segy.max())
+        expected = np.rint((np.clip(vol_segy, low, high) - low) * 255 / (high - low)).astype(np.uint8)
+        zslice = reader.read_zslice(9, dtype=np.uint8, clip=(low, high))
+        assert zslice.dtype == np.uint8
+        assert np.abs(zslice.astype(int) - expected[:, :, 9]).max() <= 1
+
+        scaled = reader.read_crossline_number(21, dtype=np.int16, clip=(-1, 1), scale=1000)
+        assert np.array_equal(scaled, np.rint(np.clip(vol_segy[:, 1], -1, 1) * 1000).astype(np.int16))
+
+        Conversion.block_bytes = 64
+        try:
+            out = np.empty((3, 50, 5), dtype=np.uint8)
+            lines = reader.read_inlines(0, 5, 2, out=out, order='sx', dtype=np.uint8, clip=(low, high))
+            assert lines is out
+            assert np.abs(out.astype(int) - np.transpose(expected[0:5:2], (0, 2, 1))).max() <= 1
+        finally:
+            Conversion.block_bytes = 2**20
+
+        reader.brick_size = 2
+        subvolume = reader.read_subvolume(1, 4, 0, 5, 3, 9, dtype=np.uint8, clip=(low, high), order='sxi')
+        assert np.abs(subvolume.astype(int) - np.transpose(expected[1:4, 0:5, 3:9], (2, 1, 0))).max() <= 1
+        volume = reader.read_volume(dtype=np.float16)
+        assert volume.dtype == np.float16 and np.allclose(volume, vol_segy, rtol=1e-3)
+        assert reader.read_zslice_async(9, dtype=np.uint8, clip=(low, high)).result().dtype == np.uint8
+        future = reader.read_subvolume_async(1, 4, 0, 5, 3, 9, dtype=np.uint8, clip=(low, high), order='sxi')
+        assert np.abs(future.result().astype(int) - np.transpose(expected[1:4, 0:5, 3:9], (2, 1, 0))).max() <= 1
+        # Converted a slab of inlines at a time, as the slabs complete
+        stats = reader.enable_stats()
+        future = reader.read_subvolume_async(0, 5, 1, 4, 0, 50, dtype=np.float16)
+        assert np.allclose(future.result(), vol_segy[:, 1:4], rtol=1e-3)
+        assert stats.snapshot()['read_subvolume_async']['requests'] == 3
+        reader.disable_stats()
+
+        with pytest.raises(ValueError):
+            reader.read_inline(1, out=np.empty((5, 50), dtype=np.float32), dtype=np.uint8)
+        with pytest.raises(ValueError):
+            reader.read_inline(1, dtype=np.uint8, clip=(1, -1))
+
+@pytest.mark.parametrize('dtype', [np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32, np.int64, np.uint64])
+def test_conversion_saturates(dtype):
+    info = np.iinfo(dtype)
+    data = np.array([[-7, -1, 1, 5, np.inf, np.nan]], dtype=np.float32)
+    with np.errstate(all='raise'):
+        mapped = Conversion(dtype, clip=(-1, 1))(data)
+        scaled = Conversion(dtype, scale=1e30)(data)
+    for converted in [mapped, scaled]:
+        assert converted.dtype == dtype
+        assert converted[0, 0] == converted[0, 1] == info.min
+        # float64 cannot hold the maximum of 64-bit integers, so they saturate just below
+        assert converted[0, 2] == converted[0, 3] == converted[0, 4]
+        assert 0 <= info.max - int(converted[0, 3]) <= (info.max >> 52)
+        assert converted[0, 5] == 0
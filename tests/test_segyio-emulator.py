@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 import segyio
 import pyvds
 
@@ -141,3 +142,169 @@ def compare_dt(vds_filename, sgy_filename):
 def test_tools_functions():
     compare_cube(VDS_FILE, SGY_FILE, tolerance=1e-5)
     compare_dt(VDS_FILE, SGY_FILE)
+
+
+def test_accessors_share_handle():
+    with pyvds.open(VDS_FILE) as vdsfile:
+        for accessor in [vdsfile.iline, vdsfile.xline, vdsfile.depth_slice, vdsfile.trace, vdsfile.header]:
+            assert accessor._reader is vdsfile
+            with accessor:
+                pass
+        assert vdsfile.filehandle is not None
+        assert np.array_equal(vdsfile.iline[1], vdsfile.read_inline(0))
+    assert vdsfile.filehandle is None
+
+
+def test_standalone_accessor_owns_reader():
+    with pyvds.accessors.InlineAccessor(VDS_FILE) as accessor:
+        with segyio.open(SGY_FILE) as segyfile:
+            assert np.allclose(accessor[1], segyfile.iline[1], rtol=1e-5)
+    assert accessor._reader.filehandle is None
+
+
+def test_line_slicing_is_batched():
+    cases = [(lambda f: f.iline, slice(5, 0, -2), [5, 3, 1]),
+             (lambda f: f.xline, slice(20, 25, 2), [20, 22, 24]),
+             (lambda f: f.depth_slice, slice(0, 50, 7), range(0, 50, 7))]
+    with pyvds.open(VDS_FILE) as vdsfile:
+        for brick_size in [vdsfile.brick_size, 2]:
+            vdsfile.brick_size = brick_size
+            for accessor, slice_, keys in cases:
+                lines = accessor(vdsfile)[slice_]
+                assert isinstance(lines, np.ndarray)
+                assert np.array_equal(lines, np.asarray([accessor(vdsfile)[key] for key in keys]))
+
+
+def test_bulk_trace_reads():
+    subscripts = [slice(None), slice(3, 22, 2), slice(20, 2, -3), [24, 0, 7, 7, -1], np.array([12, 13, 5])]
+    with pyvds.open(VDS_FILE) as vdsfile:
+        with segyio.open(SGY_FILE) as sgyfile:
+            for subscript in subscripts:
+                if isinstance(subscript, slice):
+                    indices = range(*subscript.indices(sgyfile.tracecount))
+                else:
+                    indices = subscript
+                sgy_traces = np.asarray([sgyfile.trace[i] for i in indices])
+                vds_traces = vdsfile.trace[subscript]
+                assert vds_traces.shape == sgy_traces.shape
+                assert np.allclose(vds_traces, sgy_traces, rtol=1e-5)
+
+                vds_headers = vdsfile.header[subscript]
+                raw_headers = vdsfile.header.raw[subscript]
+                assert len(vds_headers) == len(sgy_traces)
+                assert raw_headers.shape == (len(sgy_traces), 240)
+                sgy_headers = [sgyfile.header[i] for i in indices]
+                for vds_header, raw_header, sgy_header in zip(vds_headers, raw_headers, sgy_headers):
+                    assert vds_header == sgy_header
+                    assert segyio.segy.Field(raw_header.tobytes(), kind='trace') == sgy_header
+
+
+def test_bulk_trace_reads_are_grouped():
+    with pyvds.open(VDS_FILE) as vdsfile:
+        requests = []
+        request = vdsfile.access_manager.requestVolumeSubset
+        def counting_request(*args, **kwargs):
+            requests.append(kwargs)
+            return request(*args, **kwargs)
+        vdsfile.access_manager.requestVolumeSubset = counting_request
+
+        vdsfile.trace[3:22]
+        assert len(requests) == 3
+        del requests[:]
+        vdsfile.header.raw[:]
+        assert len(requests) == 1
+
+
+def test_attributes():
+    fields = [segyio.TraceField.INLINE_3D, segyio.TraceField.CROSSLINE_3D,
+              segyio.TraceField.CDP_X, segyio.TraceField.TRACE_SAMPLE_COUNT]
+    subscripts = [slice(None), slice(3, 22, 2), 7, [24, 0, 7]]
+    with pyvds.open(VDS_FILE) as vdsfile:
+        with segyio.open(SGY_FILE) as sgyfile:
+            for field in fields:
+                vds_attrs = vdsfile.attributes(field)
+                sgy_attrs = sgyfile.attributes(field)
+                assert len(vds_attrs) == len(sgy_attrs)
+                assert np.array_equal(np.asarray(vds_attrs), sgy_attrs[:])
+                for subscript in subscripts:
+                    assert np.array_equal(vds_attrs[subscript], sgy_attrs[subscript])
+                assert np.array_equal(vds_attrs[-1], sgy_attrs[len(sgy_attrs) - 1])
+
+
+def test_iteration_streams_with_prefetch():
+    with pyvds.open(VDS_FILE) as vdsfile:
+        for prefetch in [0, 1, 8]:
+            for accessor in [vdsfile.iline, vdsfile.xline, vdsfile.depth_slice, vdsfile.trace]:
+                accessor.prefetch = prefetch
+                iterator = iter(accessor)
+                assert not isinstance(iterator, list)
+                assert np.array_equal(np.asarray(list(iterator)), accessor[:])
+            vdsfile.header.prefetch = prefetch
+            assert list(vdsfile.header) == vdsfile.header[:]
+        assert [key for key, _ in vdsfile.iline.items()] == list(vdsfile.ilines)
+
+
+def test_partial_iteration():
+    with pyvds.open(VDS_FILE) as vdsfile:
+        with segyio.open(SGY_FILE) as sgyfile:
+            for vds_trace, sgy_trace in zip(vdsfile.trace, sgyfile.trace[:7]):
+                assert np.allclose(vds_trace, sgy_trace, rtol=1e-5)
+
+
+def test_accessor_buffer_reuse():
+    with pyvds.open(VDS_FILE) as vdsfile:
+        expected = [vdsfile.iline[i] for i in vdsfile.ilines]
+        buffers = [np.empty((5, 50), dtype=np.float32) for _ in range(2)]
+        vdsfile.iline.use_buffers(buffers)
+        lines = [vdsfile.iline[i] for i in vdsfile.ilines[:3]]
+        assert lines[0] is buffers[0] and lines[1] is buffers[1] and lines[2] is buffers[0]
+        assert np.array_equal(lines[1], expected[1])
+        assert np.array_equal(lines[2], expected[2])
+
+        vdsfile.trace.use_buffers(1)
+        assert vdsfile.trace[3] is vdsfile.trace[4]
+        vdsfile.trace.use_buffers(None)
+        assert vdsfile.trace[3] is not vdsfile.trace[4]
+
+        with pytest.raises(TypeError):
+            vdsfile.header.use_buffers()
+
+def test_lod_accessor():
+    with pyvds.open(VDS_FILE) as vdsfile:
+        with segyio.open(SGY_FILE) as segyfile:
+            coarse = vdsfile.iline.at_lod(0)
+            assert np.allclose(coarse[3], segyfile.iline[3], rtol=1e-5)
+            assert np.allclose(coarse[1:4], np.stack([np.copy(line) for line in segyfile.iline[1:4]]), rtol=1e-5)
+        with pytest.raises(ValueError):
+            vdsfile.xline.at_lod(1)
+        with pytest.raises(TypeError):
+            vdsfile.trace.at_lod(0)
+
+def test_ordered_accessor():
+    with pyvds.open(VDS_FILE) as vdsfile:
+        with segyio.open(SGY_FILE) as segyfile:
+            sample_major = vdsfile.iline.ordered('sx')
+            assert sample_major.value_shape == [50, 5]
+            assert np.allclose(sample_major[3], segyfile.iline[3].T, rtol=1e-5)
+            assert np.allclose(sample_major[1:4], np.stack([np.copy(line.T) for line in segyfile.iline[1:4]]), rtol=1e-5)
+            for (vds_line, segy_line) in zip(sample_major, segyfile.iline):
+                assert np.allclose(vds_line, segy_line.T, rtol=1e-5)
+            assert np.allclose(vdsfile.depth_slice.ordered('xi')[7], segyfile.depth_slice[7].T, rtol=1e-5)
+        with pytest.raises(ValueError):
+            vdsfile.xline.ordered('sx')
+        with pytest.raises(TypeError):
+            vdsfile.trace.ordered('s')
+
+def test_converted_accessor():
+    with pyvds.open(VDS_FILE) as vdsfile:
+        with segyio.open(SGY_FILE) as segyfile:
+            half = vdsfile.xline.converted(np.float16)
+            assert half[21].dtype == np.float16
+            assert np.allclose(half[21], segyfile.xline[21], rtol=1e-3)
+            images = vdsfile.iline.ordered('sx').converted(np.uint8, clip=(-2, 2))
+            images.use_buffers(2)
+            for vds_line, segy_line in zip(images, segyfile.iline):
+                expected = np.rint((np.clip(segy_line.T, -2, 2) + 2) * 255 / 4)
+                assert vds_line.dtype == np.uint8 and vds_line.shape == (50, 5)
+                assert np.abs(vds_line - expected).max() <= 1
+            assert images[3].dtype == np.uint8
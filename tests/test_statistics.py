@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+import segyio
+from pyvds.read import VdsReader
+from pyvds.statistics import QuantileSketch, brick_chunks
+
+VDS_FILE = 'test_data/small.vds'
+SGY_FILE = 'test_data/small.sgy'
+
+
+def test_quantile_sketch():
+    values = np.random.default_rng(1).normal(size=10000)
+    first, second = QuantileSketch(0.01), QuantileSketch(0.01)
+    first.add(values[:3000])
+    second.add(values[3000:])
+    sketch = first.merge(second)
+    assert sketch.count == 10000
+    ordered = np.sort(values)
+    for q in [0.01, 0.25, 0.5, 0.9, 0.99]:
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert abs(sketch.quantile(q) - exact) <= 0.01 * abs(exact) + 1e-12
+    assert np.isnan(QuantileSketch().quantile(0.5))
+    with pytest.raises(ValueError):
+        first.merge(QuantileSketch(0.05))
+
+def test_statistics():
+    vol_segy = segyio.tools.cube(SGY_FILE)
+    ordered = np.sort(vol_segy, axis=None)
+    with VdsReader(VDS_FILE) as reader:
+        for brick_size in [reader.brick_size, 2]:
+            reader.brick_size = brick_size
+            stats = reader.statistics(percentiles=(1, 50, 99), max_workers=4)
+            assert stats.count == vol_segy.size
+            assert np.isclose(stats.min, vol_segy.min(), rtol=1e-5)
+            assert np.isclose(stats.max, vol_segy.max(), rtol=1e-5)
+            assert np.isclose(stats.mean, vol_segy.mean(dtype=np.float64), rtol=1e-5)
+            assert np.isclose(stats.std, vol_segy.std(dtype=np.float64), rtol=1e-4)
+            assert np.isclose(stats.rms, np.sqrt(np.mean(vol_segy.astype(np.float64) ** 2)), rtol=1e-5)
+            for p, value in stats.percentiles.items():
+                exact = ordered[int(p / 100 * (len(ordered) - 1))]
+                assert np.isclose(value, exact, rtol=0.011)
+
+        sampled = reader.statistics(sample=0.25)
+        assert 0 < sampled.count < vol_segy.size
+        assert len(brick_chunks(reader, sample=0.25)) == round(0.25 * len(brick_chunks(reader)))
+        assert reader.statistics(sample=0.25) == sampled
+
+        # A brick at lod 1 covers twice the voxels along every axis
+        reader.brick_size = 2
+        coarse = brick_chunks(reader, lod=1)
+        assert len(coarse) == 2 * 2 * 13
+        assert coarse[1] == ((0, 0, 4), (4, 4, 8))
+        with pytest.raises(ValueError):
+            reader.statistics(lod=1)
+
+def test_histogram():
+    vol_segy = segyio.tools.cube(SGY_FILE)
+    with VdsReader(VDS_FILE) as reader:
+        reader.brick_size = 4
+        counts, edges = reader.histogram(bins=16, range=(1, 6), max_workers=2)
+        expected, expected_edges = np.histogram(vol_segy, bins=16, range=(1, 6))
+        assert np.allclose(edges, expected_edges)
+        assert np.abs(counts - expected).sum() <= 2
+        counts, edges = reader.histogram(bins=8)
+        assert counts.sum() == vol_segy.size
+        assert np.isclose(edges[0], vol_segy.min(), rtol=1e-5) and np.isclose(edges[-1], vol_segy.max(), rtol=1e-5)
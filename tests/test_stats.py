@@ -0,0 +1,62 @@
+import logging
+import numpy as np
+import segyio
+import pyvds
+from pyvds.read import VdsReader
+from pyvds.stats import RequestStats, log_requests
+
+VDS_FILE = 'test_data/small.vds'
+SGY_FILE = 'test_data/small.sgy'
+
+
+def test_request_stats():
+    vol_segy = segyio.tools.cube(SGY_FILE)
+    with VdsReader(VDS_FILE) as reader:
+        assert reader.stats is None
+        stats = reader.enable_stats()
+        records = []
+        stats.add_callback(records.append)
+
+        assert np.allclose(reader.read_inline(1), vol_segy[1], rtol=1e-5)
+        reader.read_inline(2, out=np.empty((5, 50), dtype=np.float32))
+        reader.read_subvolume(0, 2, 0, 3, 0, 10)
+        reader.read_subvolume_async(0, 2, 0, 3, 0, 10).result()
+        reader.read_traces([0, 1, 7])
+        reader.read_trace_headers([3])
+        reader.read_trace_field(segyio.TraceField.INLINE_3D, [3])
+
+        snapshot = stats.snapshot()
+        assert snapshot['read_inline']['requests'] == 2
+        assert snapshot['read_inline']['nbytes'] == 2 * 5 * 50 * 4
+        assert snapshot['read_inline']['bricks'] == 2
+        assert sum(snapshot['read_inline']['histogram']) == 2
+        assert len(snapshot['read_inline']['histogram']) == len(RequestStats.buckets) + 1
+        assert snapshot['read_subvolume']['nbytes'] == 2 * 3 * 10 * 4
+        assert snapshot['read_subvolume_async']['requests'] == 1
+        assert snapshot['read_traces']['requests'] == 2
+        assert snapshot['read_trace_headers']['nbytes'] == 240
+        assert snapshot['read_trace_field']['nbytes'] == 4
+
+        assert len(records) == sum(method['requests'] for method in snapshot.values())
+        assert records[0].method == 'read_inline'
+        assert records[0].lo == (1, 0, 0) and records[0].hi == (2, 5, 50)
+        assert records[0].wait_seconds >= 0 and records[0].issue_seconds >= 0
+
+        stats.reset()
+        assert stats.snapshot() == {}
+        reader.disable_stats()
+        reader.read_inline(3)
+        assert stats.snapshot() == {}
+
+def test_shared_stats_and_logging(caplog):
+    stats = RequestStats()
+    stats.add_callback(log_requests())
+    with caplog.at_level(logging.DEBUG, logger='pyvds'):
+        with pyvds.open(VDS_FILE) as first, pyvds.open(VDS_FILE) as second:
+            first.enable_stats(stats)
+            second.enable_stats(stats)
+            first.xline[21]
+            second.header[3]
+    assert stats.snapshot()['read_crossline']['requests'] == 1
+    assert stats.snapshot()['gen_trace_header']['requests'] == 1
+    assert 'read_crossline (0, 1, 0):(5, 2, 50) lod 0: 1000 bytes, 1 bricks' in caplog.text
@@ -0,0 +1,97 @@
+import threading
+import numpy as np
+import pytest
+import segyio
+import pyvds
+from pyvds.read import VdsReader
+
+VDS_FILE = 'test_data/small.vds'
+SGY_FILE = 'test_data/small.sgy'
+
+
+@pytest.mark.parametrize('axis, read', [('iline', 'read_inline'),
+                                         ('xline', 'read_crossline'),
+                                         ('zslice', 'read_zslice')])
+def test_sweep_reads_each_slab_once(axis, read):
+    vol_segy = segyio.tools.cube(SGY_FILE)
+    expected = np.moveaxis(vol_segy, {'iline': 0, 'xline': 1, 'zslice': 2}[axis], 0)
+    with VdsReader(VDS_FILE) as reader:
+        reader.brick_size = 2
+        stats = reader.enable_stats()
+        with reader.sweep(axis) as sweep:
+            for index in range(len(expected)):
+                line = getattr(reader, read)(index)
+                assert line.flags.writeable
+                assert np.allclose(line, expected[index], rtol=1e-5)
+            assert sweep.nbytes > 0
+        assert sweep.nbytes == 0
+        assert sweep.slabs_read == (len(expected) + 1) // 2
+        assert stats.snapshot()['read_subvolume']['requests'] == sweep.slabs_read
+        # Every brick of the 3x3x25 grid is decompressed once
+        assert stats.snapshot()['read_subvolume']['bricks'] == 3 * 3 * 25
+
+        getattr(reader, read)(0)
+        assert stats.snapshot()[read]['requests'] == 1
+
+def test_sweep_options_and_accessors():
+    vol_segy = segyio.tools.cube(SGY_FILE)
+    with pyvds.open(VDS_FILE) as vdsfile:
+        vdsfile.brick_size = 2
+        with vdsfile.sweep('xline') as sweep:
+            out = np.empty((50, 5), dtype=np.float32)
+            assert vdsfile.read_crossline(3, out=out, order='si') is out
+            assert np.allclose(out, vol_segy[:, 3].T, rtol=1e-5)
+            assert vdsfile.read_crossline(2, dtype=np.float16).dtype == np.float16
+            for i, line in enumerate(vdsfile.xline):
+                assert np.allclose(line, vol_segy[:, i], rtol=1e-5)
+            assert np.allclose(vdsfile.iline[2], vol_segy[1], rtol=1e-5)
+            assert sweep.slabs_read == 4
+            with pytest.raises(IndexError):
+                vdsfile.read_crossline(5)
+        with pytest.raises(ValueError):
+            vdsfile.sweep('trace')
+
+def test_sweeps_exited_out_of_order():
+    vol_segy = segyio.tools.cube(SGY_FILE)
+    with VdsReader(VDS_FILE) as reader:
+        reader.brick_size = 2
+        first, second = reader.sweep('xline'), reader.sweep('xline')
+        first.__enter__()
+        second.__enter__()
+        first.__exit__(None, None, None)
+        reader.read_crossline(0)
+        assert (first.slabs_read, second.slabs_read) == (0, 1)
+        second.__exit__(None, None, None)
+        assert np.allclose(reader.read_crossline(3), vol_segy[:, 3], rtol=1e-5)
+        assert (first.slabs_read, second.slabs_read) == (0, 1)
+        assert first.nbytes == second.nbytes == 0
+
+def test_sweeps_are_per_thread():
+    vol_segy = segyio.tools.cube(SGY_FILE)
+    with VdsReader(VDS_FILE) as reader:
+        reader.brick_size = 2
+        entered, done = threading.Barrier(2), threading.Barrier(2)
+        sweeps, errors = {}, []
+
+        def sweep(axis, read, expected):
+            try:
+                with reader.sweep(axis) as sweeps[axis]:
+                    entered.wait()
+                    for index in range(len(expected)):
+                        assert np.allclose(getattr(reader, read)(index), expected[index], rtol=1e-5)
+                    done.wait()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=sweep, args=('iline', 'read_inline', vol_segy)),
+                   threading.Thread(target=sweep, args=('xline', 'read_crossline', vol_segy.transpose(1, 0, 2)))]
+        for thread in threads:
+            thread.start()
+        stats = reader.enable_stats()
+        for thread in threads:
+            thread.join()
+        assert not errors
+        assert sweeps['iline'].slabs_read == sweeps['xline'].slabs_read == 3
+        # Reads from this thread never went through the other threads' sweeps
+        reader.read_crossline(1)
+        assert stats.snapshot()['read_crossline']['requests'] == 1